@@ -105,6 +105,8 @@ def _extract_save_root(item: Dict[str, Any]) -> str:
             pass
     return ""
 
+_TZ_SUFFIX_RE = re.compile(r"[+-]\d{2}:\d{2}$")
+
 def _normalize_source_mtime(item: Dict[str, Any], decoded_path: str) -> str:
     """
     Ensure a concrete UTC DATETIME string for source_mtime.
@@ -117,7 +119,7 @@ def _normalize_source_mtime(item: Dict[str, Any], decoded_path: str) -> str:
     m_str = (m or "").strip() if isinstance(m, str) else ""
     if m_str:
         s = m_str.replace("T", " ").split(".", 1)[0]
-        s = re.sub(r"[+-]\d{2}:\d{2}$", "", s).strip()
+        s = _TZ_SUFFIX_RE.sub("", s).strip()
         return s
     return _coalesce_datetime(_utc_dt_from_path(decoded_path))
 
@@ -2,9 +2,16 @@
 import argparse, json, sys, csv, hashlib, os
 from collections import defaultdict, deque
 
+try:
+    import orjson  # optional; C parser for multi-MB decoded saves
+except ImportError:
+    orjson = None
+
 GOOD_TYPES = {"Substance", "Product"}
 # typical stack caps we consider "sane"
 SANE_CAPS = {50, 100, 101, 200, 250, 500, 801, 1000, 1001, 2000, 9999}
+# --out-slots CSV columns
+SLOT_FIELDS = ("owner_type", "inventory", "container_id", "slot_index", "resource_id", "amount")
 
 # deny-list for progress/season tokens
 def is_progress_token(rid: str) -> bool:
@@ -20,7 +27,13 @@ def is_progress_token(rid: str) -> bool:
 
 def load_json(path):
     with open(path, "rb") as f:
-        return json.loads(f.read().decode("utf-8"))
+        data = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity etc.: let the stdlib parse (or report) it
+    return json.loads(data.decode("utf-8"))
 
 def walk(obj):
     """Yield (path_list, parent_dict, key_of_parent, obj_dict) for every dict."""
@@ -35,6 +48,30 @@ def walk(obj):
             for i, v in enumerate(val):
                 stack.append((path + [i], val, i, v))
 
+def iter_slot_candidates(obj):
+    """
+    Yield (path_list, obj_dict) for the dicts walk() would yield whose 'b2n' is a '^' id,
+    in the same order. Specialized walk for the slot scan: scalars are never pushed
+    (they can't hold a slot) and the first slot-shape test runs inline, so the vast
+    majority of nodes cost no tuple, no path copy and no generator round-trip.
+    """
+    stack = [([], obj)]
+    pop, push = stack.pop, stack.append
+    containers = (dict, list)
+    while stack:
+        path, val = pop()
+        if isinstance(val, dict):
+            idv = val.get("b2n")
+            if isinstance(idv, str) and idv.startswith("^"):
+                yield path, val
+            for k, v in val.items():
+                if isinstance(v, containers):
+                    push((path + [k], v))
+        else:
+            for i, v in enumerate(val):
+                if isinstance(v, containers):
+                    push((path + [i], v))
+
 def path_has_bad_context(path_list):
     # ignore any dict that sits under a segment named like 'RQA' or 'b69' or 'JWK'
     for seg in path_list:
@@ -50,6 +87,7 @@ def obj_is_slot(d):
     # shape: {'Vn8': {'elv':'Substance'|'Product'}, 'b2n':'^ID', '1o9':int, 'F9q':int, ...}
     if not isinstance(d, dict): return False
     idv = d.get("b2n")
+    if not (isinstance(idv, str) and idv.startswith("^")): return False
     v8  = dict_get(d, "Vn8", {})
     elv = dict_get(v8, "elv")
     a   = d.get("1o9")
@@ -65,6 +103,33 @@ def obj_is_slot(d):
         return True
     return False
 
+# Exact path segments that mark an owner, in priority order (a higher-priority marker
+# anywhere in the path wins over a lower one, wherever that one sits)
+_OWNER_SEGS = {";l5": 0, "P;m": 1, "<IP": 2, "3Nc": 3, "8ZP": 4}
+_OWNER_NAMES = ("SUIT", "SHIP", "FREIGHTER", "STORAGE", "VEHICLE")
+_OWNER_DOTTED = tuple((f".{seg}.", _OWNER_NAMES[r]) for seg, r in _OWNER_SEGS.items())
+
+def infer_owner(path_list):
+    """Owner from exact path-segment membership, else the legacy dotted-pattern scan; 'UNKNOWN' if neither."""
+    # One pass with a rank lookup per segment: no per-slot set/str() building,
+    # and a SUIT marker (top priority) ends the scan
+    best = len(_OWNER_NAMES)
+    rank = _OWNER_SEGS.get
+    for p in path_list:
+        r = rank(p)
+        if r is not None and r < best:
+            best = r
+            if not r:
+                break
+    if best < len(_OWNER_NAMES):
+        return _OWNER_NAMES[best]
+    # fallback: scan a much larger tail of the path for the legacy dotted patterns
+    pstr = ".".join(str(p) for p in path_list[-256:])
+    for pat, owner in _OWNER_DOTTED:
+        if pat in pstr:
+            return owner
+    return "UNKNOWN"
+
 def path_signature(path_list):
     # make a stable-ish container signature from a prefix of the path
     # we purposely exclude indexes to avoid per-run variance
@@ -88,11 +153,12 @@ def main():
     auto_slot_counter = defaultdict(int)
 
 
-    for path, parent, pkey, obj in walk(data):
-        if path_has_bad_context(path):
-            continue
+    for path, obj in iter_slot_candidates(data):
+        # Slot shape first, before any path scan
         if not obj_is_slot(obj):
             continue
+        if path_has_bad_context(path):
+            continue
 
         rid = obj["b2n"]
         if is_progress_token(rid):
@@ -124,32 +190,7 @@ def main():
                 inv = "CARGO"
 
         # owner inference: widen the search window and check segment membership
-        owner = "UNKNOWN"
-        # consider ALL string segments for exact membership checks
-        segs = {str(p) for p in path if isinstance(p, str)}
-        if ";l5" in segs:
-            owner = "SUIT"
-        elif "P;m" in segs:
-            owner = "SHIP"
-        elif "<IP" in segs:
-            owner = "FREIGHTER"
-        elif "3Nc" in segs:
-            owner = "STORAGE"
-        elif "8ZP" in segs:
-            owner = "VEHICLE"
-        else:
-            # fallback: scan a much larger tail of the path for the legacy dotted patterns
-            pstr = ".".join(str(p) for p in path[-256:])
-            if ".;l5." in pstr:
-                owner = "SUIT"
-            elif ".P;m." in pstr:
-                owner = "SHIP"
-            elif ".<IP." in pstr:
-                owner = "FREIGHTER"
-            elif ".3Nc." in pstr:
-                owner = "STORAGE"
-            elif ".8ZP." in pstr:
-                owner = "VEHICLE"
+        owner = infer_owner(path)
 
         if owner == "FREIGHTER":
             owner = "FRIGATE"
@@ -214,14 +255,9 @@ def main():
 
 
 
-            slots_rows.append({
-                "owner_type": owner,
-                "inventory": inv,
-                "container_id": container,
-                "slot_index": slot_index if slot_index is not None else -1,
-                "resource_id": rid,
-                "amount": amt,
-            })
+            # Tuples in SLOT_FIELDS order: csv.writer takes them as-is, no per-row dict
+            slots_rows.append((owner, inv, container,
+                               slot_index if slot_index is not None else -1, rid, amt))
 
     # write totals
     os.makedirs(os.path.dirname(args.out_totals), exist_ok=True)
@@ -235,10 +271,9 @@ def main():
     if args.out_slots:
         os.makedirs(os.path.dirname(args.out_slots), exist_ok=True)
         with open(args.out_slots, "w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=["owner_type","inventory","container_id","slot_index","resource_id","amount"])
-            w.writeheader()
-            for row in slots_rows:
-                w.writerow(row)
+            w = csv.writer(f)
+            w.writerow(SLOT_FIELDS)
+            w.writerows(slots_rows)
 
     # human-friendly summary to stdout
     print("Top totals:")
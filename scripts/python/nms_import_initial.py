@@ -29,15 +29,24 @@ Typical piping:
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
 import re
 import shlex
 import subprocess
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Package-import shim for direct execution (python scripts/python/nms_import_initial.py ...)
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from scripts.python.pipeline._hashcache import get_or_compute as _cached_hash
+from scripts.python.pipeline._hashio import sha256_file as _sha256_overlapped
 
 # ---------- stderr logging ----------
 def log(msg: str) -> None:
@@ -51,22 +60,34 @@ except Exception:
 
 DATA_DIR_PATH = Path(DATA_DIR)
 DECODED_DIR = DATA_DIR_PATH / ".cache" / "decoded"
+HASH_CACHE_DB = DATA_DIR_PATH / ".cache" / "hashes.sqlite"
 DEFAULT_MANIFEST_NAME = "_manifest_recent.json"
 DEFAULT_DAYS = 30
+HASH_WORKERS = 4
+DECODE_WORKERS = min(8, os.cpu_count() or 1)
 DB_IMPORT = Path(__file__).with_name("db_import_initial.py")
 
 # ---------- dotenv helpers ----------
-def load_dotenv(repo_root: Path) -> dict:
+@functools.lru_cache(maxsize=8)
+def _parse_dotenv(path: str, mtime_ns: int) -> Tuple[Tuple[str, str], ...]:
+    # Keyed on (path, mtime_ns) so repeat loads skip the parse until .env changes.
     env = {}
-    dotenv = repo_root / ".env"
-    if dotenv.exists():
-        for line in dotenv.read_text(encoding="utf-8").splitlines():
+    with open(path, encoding="utf-8") as fh:
+        for line in fh.read().splitlines():
             s = line.strip()
             if not s or s.startswith("#") or "=" not in s:
                 continue
             k, v = s.split("=", 1)
             env[k.strip()] = v.strip().strip("'").strip('"')
-    return env
+    return tuple(env.items())
+
+def load_dotenv(repo_root: Path) -> dict:
+    dotenv = repo_root / ".env"
+    try:
+        mtime_ns = dotenv.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    return dict(_parse_dotenv(str(dotenv), mtime_ns))
 
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
@@ -85,13 +106,9 @@ def split_dirs(value: str) -> List[str]:
 def iso_file_ts(ts: float) -> str:
     return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
-def sha256_file(path: Path) -> str:
-    import hashlib
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1 << 20), b""):
-            h.update(chunk)
-    return h.hexdigest()
+def sha256_file(path: Path | str) -> str:
+    # Reuse the digest from HASH_CACHE_DB while (size, mtime_ns) are unchanged.
+    return _cached_hash(path, _sha256_overlapped, db_path=HASH_CACHE_DB)
 
 # ---------- age window ----------
 def cutoff_from_args(since_days: int | None, since_date: str | None) -> float:
@@ -101,40 +118,80 @@ def cutoff_from_args(since_days: int | None, since_date: str | None) -> float:
     days = since_days if since_days is not None else DEFAULT_DAYS
     return (datetime.now() - timedelta(days=days)).timestamp()
 
-def iter_recent_files(dirs: List[str], cutoff_ts: float, exts=(".hg",)) -> Tuple[List[Path], List[Path]]:
-    kept: List[Path] = []
-    skipped: List[Path] = []
+# directory (str) -> save root ("st_..." or parent-dir fallback)
+_save_root_cache: Dict[str, str] = {}
+
+def _save_root_from_str(path: str) -> str:
+    """Innermost st_* component of path, or '' when there is none."""
+    for part in reversed(path.split(os.sep)):
+        if part.startswith("st_"):
+            return part
+    return ""
+
+def _scan(base: str, exts: Tuple[str, ...], include_hidden: bool = True) -> Iterator[Tuple[float, str]]:
+    """
+    Walk base with os.scandir and yield (mtime, path) for files whose lowered
+    name ends with one of exts. Each file is stat'ed once via its DirEntry;
+    dot-directories are walked too (as rglob did) unless include_hidden is False.
+    The innermost st_* directory seen on the way down is recorded per yielding
+    directory in _save_root_cache, so infer_save_root needs no path work later.
+    """
+    stack = deque([(base, _save_root_from_str(base))])
+    while stack:
+        d, root = stack.pop()
+        try:
+            it = os.scandir(d)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if include_hidden or not name.startswith("."):
+                            stack.append((entry.path, name if name.startswith("st_") else root))
+                        continue
+                    if not name.lower().endswith(exts) or not entry.is_file():
+                        continue
+                    if root:
+                        _save_root_cache[d] = root
+                    yield entry.stat().st_mtime, entry.path
+                except FileNotFoundError:
+                    continue
+
+def iter_recent_files(dirs: List[str], cutoff_ts: float, exts=(".hg",), include_hidden: bool = True) -> Tuple[List[Tuple[Path, float]], List[Tuple[Path, float]]]:
+    """Return (kept, skipped) as newest-first (path, mtime) pairs split at cutoff_ts."""
+    kept: List[Tuple[float, str]] = []
+    skipped: List[Tuple[float, str]] = []
+    exts = tuple(e.lower() for e in exts)
     for d in dirs:
         base = Path(d).expanduser().resolve()
         if not base.exists():
             log(f"[WARN] ignoring missing directory: {base}")
             continue
-        for p in base.rglob("*"):
-            if p.is_file() and p.suffix.lower() in exts:
-                try:
-                    mtime = p.stat().st_mtime
-                except FileNotFoundError:
-                    continue
-                (kept if mtime >= cutoff_ts else skipped).append(p)
-    kept.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    skipped.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return kept, skipped
+        for mtime, path in _scan(str(base), exts, include_hidden):
+            (kept if mtime >= cutoff_ts else skipped).append((mtime, path))
+    # Sort on the mtime captured during the scan; no re-stat.
+    kept.sort(key=lambda t: t[0], reverse=True)
+    skipped.sort(key=lambda t: t[0], reverse=True)
+    return [(Path(p), m) for m, p in kept], [(Path(p), m) for m, p in skipped]
 
 def should_decode(path: Path, include_mf: bool, include_account: bool) -> bool:
     name = path.name.lower()
-    if name.startswith("mf_") and not include_mf:
+    if not include_mf and name.startswith("mf_"):
         return False
-    if "accountdata" in name and not include_account:
+    if not include_account and "accountdata" in name:
         return False
     return True
 
 # ---------- JSON cleaning ----------
 def _clean_json_bytes(raw: bytes) -> bytes:
+    # Single C-level pass deletes NULs; a leading BOM has none, so it is still the
+    # first 3 bytes afterwards and is sliced off the (already smaller) result.
+    out = raw.translate(None, b"\x00")
     if raw.startswith(b"\xef\xbb\xbf"):
-        raw = raw[3:]
-    if b"\x00" in raw:
-        raw = raw.replace(b"\x00", b"")
-    return raw.strip()
+        out = out[3:]
+    return out.strip()
 
 def _slice_to_json(raw: bytes) -> bytes:
     raw = _clean_json_bytes(raw)
@@ -145,80 +202,119 @@ def _slice_to_json(raw: bytes) -> bytes:
     positions = [x for x in (i_obj, i_arr) if x != -1]
     if not positions:
         return b""
+    # raw[start] is already '{' or '['; no lstrip copy needed.
     start = min(positions)
-    cand = raw[start:].lstrip()
-    return cand if cand[:1] in (b"{", b"[") else b""
+    return raw[start:] if start else raw
 
 # ---------- save-root inference ----------
-def infer_save_root(path: Path) -> str:
-    for part in path.resolve().parts[::-1]:
-        if part.startswith("st_"):
-            return part
-    return path.parent.name
+def infer_save_root(path: Path | str) -> str:
+    # Inputs are already absolute/resolved (scan bases, explicit inputs, out_decoded),
+    # so a string lookup keyed by the parent directory replaces resolve()+parts.
+    parent = os.path.dirname(str(path))
+    root = _save_root_cache.get(parent)
+    if root is None:
+        root = _save_root_from_str(parent) or os.path.basename(parent)
+        _save_root_cache[parent] = root
+    return root
 
 # ---------- nmssavetool runner ----------
-def run_nmssavetool(src: Path, out_json: Path, decoder_hint: str | None) -> None:
+# argv placeholders substituted per file
+SRC_ARG = "{src}"
+OUT_ARG = "{out}"
+
+# Winning (argv_template, mode) per decoder hint, so later files in the same run
+# skip straight to the CLI shape that worked instead of re-probing every variant.
+_decoder_recipe_cache: Dict[str, Tuple[List[str], str]] = {}
+
+@functools.lru_cache(maxsize=None)
+def _decoder_argv(decoder_hint: str | None) -> Tuple[str, ...]:
     """
-    Try stdout-first and file-output patterns, including 'decompress' and -i/-o variants.
-    Accept JSON from stdout or stderr; slice to first JSON token; strip BOM/NULs.
+    Resolve the decoder command prefix once per hint: python3 for scripts,
+    the path itself for a standalone executable, else nmssavetool on PATH.
     """
-    out_json.parent.mkdir(parents=True, exist_ok=True)
-    attempts: List[Tuple[List[str], str]] = []
+    if not decoder_hint:
+        return ("nmssavetool",)
+    tool = str(Path(decoder_hint))
+    if not tool.endswith(".py") and os.path.isfile(tool) and os.access(tool, os.X_OK):
+        return (tool,)
+    return ("python3", tool)
+
+def _decoder_attempts(decoder_hint: str | None) -> List[Tuple[List[str], str]]:
+    cmd = list(_decoder_argv(decoder_hint))
     if decoder_hint:
-        tool = str(Path(decoder_hint))
-        attempts += [
+        return [
             # Your decoder (preferred): --in/--out writes directly to file
-            (["python3", tool, "--in", str(src), "--out", str(out_json)], "file"),
+            (cmd + ["--in", SRC_ARG, "--out", OUT_ARG], "file"),
             # Allow short aliases too (now supported by nms_hg_decoder.py)
-            (["python3", tool, "-i", str(src), "-o", str(out_json)], "file"),
+            (cmd + ["-i", SRC_ARG, "-o", OUT_ARG], "file"),
 
             # Fallbacks for nmssavetool-style CLIs (if a user points to that instead)
-            (["python3", tool, str(src)], "cap"),
-            (["python3", tool, "dump", str(src)], "cap"),
-            (["python3", tool, "decode", str(src)], "cap"),
-            (["python3", tool, "decompress", str(src), str(out_json)], "file"),
-        ]
-
-    else:
-        attempts += [
-            (["nmssavetool", str(src)], "cap"),
-            (["nmssavetool", "dump", str(src)], "cap"),
-            (["nmssavetool", "decode", str(src)], "cap"),
-            (["nmssavetool", "decompress", str(src), str(out_json)], "file"),
-            (["nmssavetool", "-i", str(src), "-o", str(out_json)], "file"),
+            (cmd + [SRC_ARG], "cap"),
+            (cmd + ["dump", SRC_ARG], "cap"),
+            (cmd + ["decode", SRC_ARG], "cap"),
+            (cmd + ["decompress", SRC_ARG, OUT_ARG], "file"),
         ]
-
-    errors: List[str] = []
-    for argv, mode in attempts:
-        try:
-            res = subprocess.run(argv, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            if mode == "cap":
+    return [
+        (cmd + [SRC_ARG], "cap"),
+        (cmd + ["dump", SRC_ARG], "cap"),
+        (cmd + ["decode", SRC_ARG], "cap"),
+        (cmd + ["decompress", SRC_ARG, OUT_ARG], "file"),
+        (cmd + ["-i", SRC_ARG, "-o", OUT_ARG], "file"),
+    ]
+
+def _run_decoder_attempt(argv: List[str], mode: str, out_json: Path, errors: List[str]) -> bool:
+    """Run one decoder invocation; write sliced JSON to out_json and return True on success."""
+    try:
+        res = subprocess.run(argv, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if mode == "cap":
+            for stream in (res.stdout, res.stderr):
+                data = _slice_to_json(stream or b"")
+                if data:
+                    out_json.write_bytes(data)
+                    return True
+            errors.append(f"{' '.join(map(shlex.quote, argv))} -> no JSON on stdout/stderr after slicing")
+        else:
+            # file mode
+            if out_json.exists():
+                data = _slice_to_json(out_json.read_bytes())
+                if data:
+                    out_json.write_bytes(data)
+                    return True
+                out_json.unlink(missing_ok=True)
+                errors.append(f"{' '.join(map(shlex.quote, argv))} -> wrote file but not valid JSON")
+            else:
+                # some builds still write JSON to a stream even with -o
                 for stream in (res.stdout, res.stderr):
                     data = _slice_to_json(stream or b"")
                     if data:
                         out_json.write_bytes(data)
-                        return
-                errors.append(f"{' '.join(map(shlex.quote, argv))} -> no JSON on stdout/stderr after slicing")
-            else:
-                # file mode
-                if out_json.exists():
-                    data = _slice_to_json(out_json.read_bytes())
-                    if data:
-                        out_json.write_bytes(data)
-                        return
-                    out_json.unlink(missing_ok=True)
-                    errors.append(f"{' '.join(map(shlex.quote, argv))} -> wrote file but not valid JSON")
-                else:
-                    # some builds still write JSON to a stream even with -o
-                    for stream in (res.stdout, res.stderr):
-                        data = _slice_to_json(stream or b"")
-                        if data:
-                            out_json.write_bytes(data)
-                            return
-                    errors.append(f"{' '.join(map(shlex.quote, argv))} -> no output file created")
-        except subprocess.CalledProcessError as e:
-            msg = (e.stderr or b"").decode("utf-8", errors="ignore").strip()
-            errors.append(f"{' '.join(map(shlex.quote, argv))}\n{msg}")
+                        return True
+                errors.append(f"{' '.join(map(shlex.quote, argv))} -> no output file created")
+    except subprocess.CalledProcessError as e:
+        msg = (e.stderr or b"").decode("utf-8", errors="ignore").strip()
+        errors.append(f"{' '.join(map(shlex.quote, argv))}\n{msg}")
+    return False
+
+def run_nmssavetool(src: Path, out_json: Path, decoder_hint: str | None) -> None:
+    """
+    Try stdout-first and file-output patterns, including 'decompress' and -i/-o variants.
+    Accept JSON from stdout or stderr; slice to first JSON token; strip BOM/NULs.
+    The first recipe that works is remembered and tried first for later files.
+    """
+    out_json.parent.mkdir(parents=True, exist_ok=True)
+    recipe_key = decoder_hint or ""
+    templates = _decoder_attempts(decoder_hint)
+    cached = _decoder_recipe_cache.get(recipe_key)
+    if cached:
+        templates = [cached] + [t for t in templates if t != cached]
+    subst = {SRC_ARG: str(src), OUT_ARG: str(out_json)}
+
+    errors: List[str] = []
+    for template, mode in templates:
+        argv = [subst.get(a, a) for a in template]
+        if _run_decoder_attempt(argv, mode, out_json, errors):
+            _decoder_recipe_cache[recipe_key] = (template, mode)
+            return
 
     raise SystemExit(
         "[ERR] Failed to decode JSON from save file.\n"
@@ -227,9 +323,44 @@ def run_nmssavetool(src: Path, out_json: Path, decoder_hint: str | None) -> None
         f"  decoder: {decoder_hint or 'nmssavetool (PATH)'}\n"
         "  Tried:\n- " + "\n- ".join(errors) + "\n"
         "Hint (manual test):\n"
-        f'  python3 "{decoder_hint or "nmssavetool"}" decompress "{src}" "{out_json}"\n'
+        f"  {shlex.join([*_decoder_argv(decoder_hint), 'decompress', str(src), str(out_json)])}\n"
     )
 
+# ---------- batch decode ----------
+def _decode_one(src: Path, src_mtime: float, out_json: Path, decoder_hint: str | None, decoder_used: str) -> Dict[str, Any]:
+    """Decode one save and return its manifest item (json_sha256 filled in by the caller)."""
+    log(f"[decode] {src} -> {out_json}")
+    run_nmssavetool(src, out_json, decoder_hint)
+    src_m = iso_file_ts(src_mtime)  # captured by the directory scan; no re-stat
+    try:
+        dec_m = iso_file_ts(out_json.stat().st_mtime)
+    except Exception:
+        src_m, dec_m = "", ""
+    return {
+        "source_path": str(src),
+        "save_root": infer_save_root(src),
+        "source_mtime": src_m,
+        "decoded_mtime": dec_m,
+        "out_json": str(out_json),
+        "json_sha256": "",
+        "decoder_used": decoder_used
+    }
+
+def _decode_group(jobs: List[Tuple[int, Path, float]], out_json: Path, decoder_hint: str | None, decoder_used: str,
+                  hash_pool: ThreadPoolExecutor) -> List[Tuple[int, Dict[str, Any], Future]]:
+    """Decode saves that share out_json in order; return (index, item, hash_future) per save."""
+    out: List[Tuple[int, Dict[str, Any], Future]] = []
+    for idx, src, src_mtime in jobs:
+        if out:
+            # Don't overwrite out_json while the previous decode is still being hashed.
+            try:
+                out[-1][2].result()
+            except Exception:
+                pass
+        item = _decode_one(src, src_mtime, out_json, decoder_hint, decoder_used)
+        out.append((idx, item, hash_pool.submit(sha256_file, out_json)))
+    return out
+
 # ---------- full-parse runner ----------
 FULLPARSE_DIR = DATA_DIR_PATH / "output" / "fullparse"
 
@@ -278,16 +409,31 @@ def parse_args() -> argparse.Namespace:
     return ap.parse_args()
 
 # ---------- manifest ----------
-def write_manifest(items: List[Dict[str, Any]], manifest_path: Path, cutoff_ts: float | None, recent_only: bool, decoder_used: str) -> None:
-    doc = {
-        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-        "cutoff": (None if cutoff_ts is None else iso_file_ts(cutoff_ts)),
-        "recent_only": recent_only,
-        "items": items,
-        "decoder_used": decoder_used,
-    }
+def _dumps_indented(obj: Any) -> bytes:
+    """indent=2 JSON as bytes; json.dumps defaults (ensure_ascii), as the manifest has always been written."""
+    return json.dumps(obj, indent=2).encode("ascii")
+
+def write_manifest(items: Iterable[Dict[str, Any]], manifest_path: Path, cutoff_ts: float | None, recent_only: bool, decoder_used: str) -> int:
+    """
+    Stream the manifest to disk one item at a time (items may be a generator),
+    so the whole document is never held in memory. Returns the item count.
+    """
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
-    manifest_path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    count = 0
+    with manifest_path.open("wb") as fh:
+        fh.write(b"{\n")
+        fh.write(b'  "generated_at": ' + _dumps_indented(datetime.now(timezone.utc).isoformat(timespec="seconds")) + b",\n")
+        fh.write(b'  "cutoff": ' + _dumps_indented(None if cutoff_ts is None else iso_file_ts(cutoff_ts)) + b",\n")
+        fh.write(b'  "recent_only": ' + _dumps_indented(recent_only) + b",\n")
+        fh.write(b'  "items": [')
+        for item in items:
+            fh.write(b",\n" if count else b"\n")
+            fh.write(b"    " + _dumps_indented(item).replace(b"\n", b"\n    "))
+            count += 1
+        fh.write(b"\n  ],\n" if count else b"],\n")
+        fh.write(b'  "decoder_used": ' + _dumps_indented(decoder_used) + b"\n")
+        fh.write(b"}")
+    return count
 
 # ---------- main ----------
 def main() -> None:
@@ -338,13 +484,18 @@ def main() -> None:
         log(f"[INFO] Cutoff: {iso_file_ts(cutoff_ts)}")
 
     # Collect recent .hg
-    kept_hg: List[Path] = []
-    skipped_hg: List[Path] = []
+    kept_hg: List[Tuple[Path, float]] = []
+    skipped_hg: List[Tuple[Path, float]] = []
     if hg_dirs:
         kept_all, skipped_all = iter_recent_files(hg_dirs, float("-inf") if cutoff_ts is None else cutoff_ts, exts=(".hg",))
         # Drop non-save files unless flags say otherwise
-        filtered = [p for p in kept_all if should_decode(p, args.include_mf, args.include_account)]
-        dropped  = [p for p in kept_all if p not in filtered]
+        filtered: List[Tuple[Path, float]] = []
+        dropped: List[Path] = []
+        for p, mt in kept_all:
+            if should_decode(p, args.include_mf, args.include_account):
+                filtered.append((p, mt))
+            else:
+                dropped.append(p)
         kept_hg, skipped_hg = filtered, skipped_all
         if dropped:
             names = ", ".join(sorted({p.name for p in dropped}))
@@ -352,8 +503,8 @@ def main() -> None:
 
         if kept_hg:
             log(f"[OK] {len(kept_hg)} recent .hg files selected:")
-            for p in kept_hg:
-                log(f"    {p} (root {infer_save_root(p)}; mtime {iso_file_ts(p.stat().st_mtime)})")
+            for p, mt in kept_hg:
+                log(f"    {p} (root {infer_save_root(p)}; mtime {iso_file_ts(mt)})")
         else:
             log("[OK] No recent .hg files found under provided dirs.")
 
@@ -375,25 +526,31 @@ def main() -> None:
     items: List[Dict[str, Any]] = []
     decoder_used = decoder_hint or "nmssavetool (PATH)"
     if args.decode and kept_hg:
-        for src in kept_hg:
-            out_json = out_decoded / (src.stem + ".json")
-            log(f"[decode] {src} -> {out_json}")
-            run_nmssavetool(src, out_json, decoder_hint)
-            try:
-                jhash = sha256_file(out_json)
-                src_m = iso_file_ts(src.stat().st_mtime)
-                dec_m = iso_file_ts(out_json.stat().st_mtime)
-            except Exception:
-                jhash, src_m, dec_m = "", "", ""
-            items.append({
-                "source_path": str(src),
-                "save_root": infer_save_root(src),
-                "source_mtime": src_m,
-                "decoded_mtime": dec_m,
-                "out_json": str(out_json),
-                "json_sha256": jhash,
-                "decoder_used": decoder_used
-            })
+        # Saves sharing a stem decode to the same out_json; keep those in one
+        # serial group so concurrent workers never write the same file.
+        groups: Dict[str, List[Tuple[int, Path, float]]] = {}
+        out_dir = str(out_decoded)
+        for idx, (src, src_mtime) in enumerate(kept_hg):
+            stem = os.path.splitext(os.path.basename(src))[0]
+            groups.setdefault(os.path.join(out_dir, stem + ".json"), []).append((idx, src, src_mtime))
+        # Decoders run concurrently (subprocess waits release the GIL); each decoded
+        # JSON is hashed on a separate pool as soon as its decode returns.
+        pending: List[Tuple[int, Dict[str, Any], Future]] = []
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as hash_pool, \
+             ThreadPoolExecutor(max_workers=min(DECODE_WORKERS, len(groups))) as decode_pool:
+            for recs in decode_pool.map(
+                lambda g: _decode_group(g[1], Path(g[0]), decoder_hint, decoder_used, hash_pool),
+                groups.items(),
+            ):
+                pending.extend(recs)
+            # Manifest order follows kept_hg (newest first), not completion order.
+            pending.sort(key=lambda t: t[0])
+            for _, item, hash_fut in pending:
+                try:
+                    item["json_sha256"] = hash_fut.result()
+                except Exception:
+                    pass
+                items.append(item)
 
     # Include explicit JSONs into manifest if provided (no decode)
     for j in json_inputs:
@@ -420,17 +577,19 @@ def main() -> None:
     else:
         # No decode/new items; synthesize manifest from existing save*.json in out_decoded
         if not manifest_path.exists():
-            cands = sorted(out_decoded.glob("save*.json"))
+            with os.scandir(out_decoded) as it:
+                cands = sorted(e.path for e in it if e.name.startswith("save") and e.name.endswith(".json"))
             synth: List[Dict[str, Any]] = []
             for j in cands:
                 try:
                     jhash = sha256_file(j)
+                    j_m = iso_file_ts(os.stat(j).st_mtime)
                     synth.append({
-                        "source_path": str(j),
+                        "source_path": j,
                         "save_root": infer_save_root(j),
-                        "source_mtime": iso_file_ts(j.stat().st_mtime),
-                        "decoded_mtime": iso_file_ts(j.stat().st_mtime),
-                        "out_json": str(j),
+                        "source_mtime": j_m,
+                        "decoded_mtime": j_m,
+                        "out_json": j,
                         "json_sha256": jhash,
                         "decoder_used": decoder_used
                     })
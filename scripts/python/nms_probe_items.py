@@ -1,25 +1,80 @@
 #!/usr/bin/env python3
 import argparse, json, sys, os
-from collections import defaultdict, deque
+from collections import defaultdict
+
+try:
+    import orjson  # optional; much faster parse for big decoded saves
+except ImportError:
+    orjson = None
 
 def load_json(path):
     with open(path, "rb") as f:
         # file is UTF-8 JSON now
-        return json.loads(f.read().decode("utf-8"))
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity etc.: let the stdlib parse (or report) it
+    return json.loads(raw.decode("utf-8"))
+
+def _children(val):
+    # Last child first: the same visiting order as popping a stack the children
+    # were pushed onto in order, which is what decides the --limit subset.
+    if isinstance(val, dict):
+        return reversed(val.items())
+    return zip(range(len(val) - 1, -1, -1), reversed(val))
 
 def walk(obj):
-    """Yield (path_list, parent, key, value) for every primitive value."""
-    stack = deque([([], None, None, obj)])
+    """
+    Yield (path, parent, key, value) for every primitive value.
+    path is ONE shared list of ancestor keys (excluding key), mutated as the walk
+    proceeds; callers that keep it must copy (e.g. path + [key]).
+    """
+    if not isinstance(obj, (dict, list)):
+        yield ([], None, None, obj)
+        return
+    path = []
+    stack = [(obj, _children(obj))]
     while stack:
-        path, parent, key, val = stack.pop()
-        if isinstance(val, dict):
-            for k, v in val.items():
-                stack.append((path+[k], val, k, v))
-        elif isinstance(val, list):
-            for i, v in enumerate(val):
-                stack.append((path+[i], val, i, v))
-        else:
+        parent, it = stack[-1]
+        for key, val in it:
+            if isinstance(val, (dict, list)):
+                path.append(key)
+                stack.append((val, _children(val)))
+                break
             yield (path, parent, key, val)
+        else:
+            stack.pop()
+            if path:
+                path.pop()
+
+def find_ids(obj, want_set, under_key=None):
+    """
+    Targeted variant of walk(): yield (path, parent, key, value) only for string
+    values in want_set held directly by a dict. Lists are only descended for
+    their containers (a list primitive can't have a dict parent). With under_key,
+    matches are reported only inside subtrees whose dict key equals under_key.
+    path is shared/mutated like walk()'s; copy it to keep it.
+    """
+    if not isinstance(obj, (dict, list)):
+        return
+    path = []
+    stack = [(obj, _children(obj), under_key is None)]
+    while stack:
+        parent, it, inside = stack[-1]
+        is_dict = parent.__class__ is dict
+        for key, val in it:
+            if isinstance(val, (dict, list)):
+                path.append(key)
+                stack.append((val, _children(val), inside or (is_dict and key == under_key)))
+                break
+            if inside and is_dict and val.__class__ is str and val in want_set:
+                yield (path, parent, key, val)
+        else:
+            stack.pop()
+            if path:
+                path.pop()
 
 def is_candidate_id(v):
     return isinstance(v, str) and v.startswith("^") and v.isascii()
@@ -46,15 +101,21 @@ def main():
     ap.add_argument("--json", required=True, help="Decoded save JSON")
     ap.add_argument("--ids", required=True, help="Comma-separated list, e.g. ^ANTIMATTER,^LAUNCHSUB,^LAND2")
     ap.add_argument("--limit", type=int, default=50, help="Max matches per ID to print")
+    ap.add_argument("--under-key", help="Only report matches inside subtrees under this dict key (e.g. Slots)")
     args = ap.parse_args()
 
     want = [s.strip() for s in args.ids.split(",") if s.strip()]
+    want_set = frozenset(w for w in want if is_candidate_id(w))
     data = load_json(args.json)
 
     matches = defaultdict(list)
-    for path, parent, key, val in walk(data):
-        if is_candidate_id(val) and val in want and isinstance(parent, dict):
-            matches[val].append((path, parent, key))
+    for path, parent, key, val in find_ids(data, want_set, under_key=args.under_key):
+        matches[val].append((path + [key], parent, key))
+
+    # Per-run memo keyed by id(parent): parents shared by several matches are only
+    # scanned/rendered once. `data` stays referenced for all of main, so ids are stable.
+    _num_cache = {}     # id(parent) -> (numeric_fields, guess_amount)
+    _render_cache = {}  # (id(parent), key) -> rendered parent string
 
     totals = {}
     for rid in want:
@@ -63,19 +124,26 @@ def main():
         taken = 0
         total_est = 0
         for path, parent, key in rows:
-            nums = numeric_fields(parent)
-            # Heuristic: "amount" is usually the largest small-ish int in the same object
-            # (ignore huge counters like 100000/160000)
-            cand = [v for v in nums.values() if 0 < v < 50000]
-            guess = max(cand) if cand else 0
+            pid = id(parent)
+            hit = _num_cache.get(pid)
+            if hit is None:
+                nums = numeric_fields(parent)
+                # Heuristic: "amount" is usually the largest small-ish int in the same object
+                # (ignore huge counters like 100000/160000)
+                cand = [v for v in nums.values() if 0 < v < 50000]
+                hit = _num_cache[pid] = (nums, max(cand) if cand else 0)
+            nums, guess = hit
             total_est += guess
             if taken < args.limit:
                 pstr = ".".join(str(p) for p in path[-8:])  # tail of path for context
+                rendered = _render_cache.get((pid, key))
+                if rendered is None:
+                    rendered = _render_cache[(pid, key)] = show_parent(parent, highlight_key=key)
                 print(f"- path_tail: {pstr}")
                 print(f"  parent_keys: {list(parent.keys())}")
                 print(f"  numeric_siblings: {nums}")
                 print(f"  guess_amount: {guess}")
-                print(f"  parent: {show_parent(parent, highlight_key=key)}")
+                print(f"  parent: {rendered}")
             taken += 1
         totals[rid] = total_est
         print(f"==> heuristic_total({rid}) ≈ {total_est}")
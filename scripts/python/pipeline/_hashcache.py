@@ -0,0 +1,91 @@
+# scripts/python/pipeline/_hashcache.py
+# Persistent file-hash cache keyed by (abs_path, st_size, st_mtime_ns).
+# Unchanged decoded saves cost one stat() instead of a full re-read on repeat runs.
+# WAL + one autocommitted INSERT per miss: concurrent pipeline processes share the DB
+# without holding its write lock, and a crash loses nothing already recorded.
+import atexit
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+DEFAULT_DB = Path(__file__).resolve().parents[3] / ".cache" / "hashes.sqlite"
+BUSY_TIMEOUT = 0.25  # seconds to wait on a locked DB before treating it as a miss/skip
+
+_lock = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+_conn_path: Optional[str] = None
+
+def _connect(db_path: Union[str, Path]) -> Optional[sqlite3.Connection]:
+    """Open (once per process) the cache DB in autocommit mode; each write commits on its own."""
+    global _conn, _conn_path
+    db_path = str(db_path)
+    if _conn is not None and _conn_path == db_path:
+        return _conn
+    try:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                               isolation_level=None)
+        try:
+            # WAL: readers never block the writer; NORMAL sync keeps per-row commits cheap
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error:
+            pass  # another process is switching modes; rollback journal still works
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS hash("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT)"
+        )
+    except sqlite3.Error:
+        return None
+    if _conn is not None:
+        _close()
+    _conn, _conn_path = conn, db_path
+    return conn
+
+def _close() -> None:
+    global _conn, _conn_path
+    if _conn is None:
+        return
+    try:
+        _conn.close()
+    except sqlite3.Error:
+        pass
+    _conn, _conn_path = None, None
+
+atexit.register(_close)
+
+def get_or_compute(path: Union[str, Path], compute_fn: Callable[[Union[str, Path]], str],
+                   db_path: Union[str, Path] = DEFAULT_DB) -> str:
+    """
+    Return the cached digest for path when (size, mtime_ns) still match, else
+    compute_fn(path) and record it. Cache errors fall back to computing.
+    Raises whatever os.stat/compute_fn raise for missing/unreadable files.
+    """
+    st = os.stat(path)
+    key = os.path.abspath(path)
+    with _lock:
+        conn = _connect(db_path)
+        if conn is not None:
+            try:
+                row = conn.execute(
+                    "SELECT size, mtime_ns, sha256 FROM hash WHERE path = ?", (key,)
+                ).fetchone()
+                if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+                    return row[2]
+            except sqlite3.Error:
+                conn = None
+
+    digest = compute_fn(path)
+
+    if conn is not None:
+        with _lock:
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO hash(path, size, mtime_ns, sha256) VALUES (?,?,?,?)",
+                    (key, st.st_size, st.st_mtime_ns, digest),
+                )
+            except sqlite3.Error:
+                pass
+    return digest
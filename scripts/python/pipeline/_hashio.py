@@ -0,0 +1,68 @@
+# scripts/python/pipeline/_hashio.py
+# Shared file-hashing helper for the pipeline scripts (nms_import_initial, build_manifest).
+import hashlib
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Union
+
+BLOCK = 1 << 20  # 1 MiB reads
+DEPTH = 4        # buffers in flight between reader and hasher
+OVERLAP_MIN = 8 * BLOCK  # below this a reader thread costs more than it hides
+
+_file_digest = getattr(hashlib, "file_digest", None)  # Python 3.11+
+
+# Fresh hashers are cloned from one prototype: copy() is cheaper than a new EVP init.
+_SHA256_PROTO = hashlib.sha256()
+
+def _sha256_inline(f) -> str:
+    """Hash an open binary file on the calling thread without per-chunk allocations."""
+    if _file_digest is not None:
+        return _file_digest(f, _SHA256_PROTO.copy).hexdigest()
+    h = _SHA256_PROTO.copy()
+    buf = bytearray(4 << 20)
+    view = memoryview(buf)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        h.update(view[:n])
+    return h.hexdigest()
+
+def sha256_file(path: Union[str, Path], depth: int = DEPTH, block: int = BLOCK) -> str:
+    """
+    Hex SHA-256 of a file's contents.
+    Reads run on a helper thread feeding a bounded queue, so disk I/O for the next
+    blocks overlaps hashing of the current one (hashlib drops the GIL on large
+    updates and uses OpenSSL's SHA extensions where the CPU has them).
+    Files under OVERLAP_MIN are hashed inline via hashlib.file_digest.
+    """
+    with open(path, "rb", buffering=0) as f:
+        if os.fstat(f.fileno()).st_size < max(OVERLAP_MIN, block):
+            return _sha256_inline(f)
+        h = _SHA256_PROTO.copy()
+
+        q: "queue.Queue[object]" = queue.Queue(maxsize=depth)
+
+        def _reader() -> None:
+            try:
+                while True:
+                    chunk = f.read(block)
+                    q.put(chunk)
+                    if not chunk:
+                        return
+            except BaseException as e:  # surface read errors on the hashing side
+                q.put(e)
+
+        t = threading.Thread(target=_reader, name="sha256-reader", daemon=True)
+        t.start()
+        while True:
+            chunk = q.get()
+            if isinstance(chunk, BaseException):
+                raise chunk
+            if not chunk:
+                break
+            h.update(chunk)
+        t.join()
+    return h.hexdigest()
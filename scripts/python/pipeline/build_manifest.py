@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-import argparse, json, os, sys, hashlib
+import argparse, hashlib, heapq, json, os, sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 # Project root: scripts/python/pipeline/ -> project root
 ROOT = Path(__file__).resolve().parents[3]
@@ -11,34 +12,86 @@ FULLPARSE_DIR = ROOT / "output" / "fullparse"
 MANIFEST_FINAL = DECODED_DIR / "_manifest_recent.json"
 MANIFEST_TMP = DECODED_DIR / "_manifest_recent.json.tmp"
 
+# Package-import shim for direct execution
+if __package__ in (None, ""):
+    sys.path.insert(0, str(ROOT))
+from scripts.python.pipeline._hashcache import get_or_compute
+from scripts.python.pipeline._hashio import sha256_file
+
+try:
+    import orjson  # optional; faster manifest serialization
+except ImportError:
+    orjson = None
+
+def _dumps(doc: Dict[str, Any]) -> bytes:
+    """Manifest bytes: indent=2, UTF-8, trailing newline."""
+    if orjson is not None:
+        return orjson.dumps(doc, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(doc, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
 def _iso_utc(ts: float) -> str:
     return datetime.fromtimestamp(ts, tz=timezone.utc).replace(microsecond=0).isoformat()
 
 def _sha256(p: Path) -> Optional[str]:
     try:
-        h = hashlib.sha256()
-        with p.open("rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                h.update(chunk)
-        return h.hexdigest()
+        return get_or_compute(p, sha256_file)
     except FileNotFoundError:
         return None
 
-def _latest_pair() -> Optional[Tuple[Path, Path]]:
-    """Pick most-recent decoded save (*.json) and its fullparse partner (<stem>.full.json)."""
-    if not DECODED_DIR.exists():
+FP_EDGE = 64 * 1024  # bytes read from each end of the file for the cheap fingerprint
+
+def _fingerprint(p: Path) -> Optional[str]:
+    """
+    Cheap change-detection identity: 'fp1:<size>:<mtime_ns>:<blake2b-64 of head+tail>'.
+    Reads at most 2*FP_EDGE bytes instead of the whole file.
+    """
+    try:
+        fd = os.open(p, os.O_RDONLY)
+    except FileNotFoundError:
         return None
-    candidates = sorted(
-        (p for p in DECODED_DIR.glob("*.json") if p.name != "_manifest_recent.json"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )
-    for src in candidates:
-        stem = src.stem  # e.g., "save" or "save2"
-        out = FULLPARSE_DIR / f"{stem}.full.json"
-        if out.exists():
-            return (src, out)
-    return None
+    try:
+        st = os.fstat(fd)
+        head = os.pread(fd, FP_EDGE, 0)
+        tail = os.pread(fd, FP_EDGE, max(st.st_size - FP_EDGE, 0)) if st.st_size > FP_EDGE else b""
+    finally:
+        os.close(fd)
+    # Always blake2b-64 (stdlib): the identity must not depend on which optional modules a host has
+    digest = hashlib.blake2b(head + tail, digest_size=8).hexdigest()
+    return f"fp1:{st.st_size}:{st.st_mtime_ns}:{digest}"
+
+def _write_via_tmpfile(final: Path, tmp: Path, data: bytes) -> bool:
+    """
+    Linux fast path: write into an unnamed O_TMPFILE inode and only link it into
+    the directory once complete, so readers never see a partial file. When the
+    final name already exists (linkat can't replace), link to tmp and rename over.
+    Returns False (nothing written) when O_TMPFILE or /proc/self/fd is unavailable.
+    """
+    if not hasattr(os, "O_TMPFILE"):
+        return False
+    try:
+        fd = os.open(final.parent, os.O_TMPFILE | os.O_WRONLY | os.O_CLOEXEC, 0o644)
+    except OSError:
+        return False
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+        proc_fd = f"/proc/self/fd/{fd}"
+        try:
+            os.link(proc_fd, final)
+        except FileExistsError:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            os.link(proc_fd, tmp)
+            os.replace(tmp, final)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
 
 def _derive_save_root_from_source_path(src: Path) -> str:
     """
@@ -50,49 +103,131 @@ def _derive_save_root_from_source_path(src: Path) -> str:
             return seg
     return ""
 
+class ManifestBuilder:
+    """
+    Single entry point for both manifest flavours:
+      - latest: newest decoded save + its fullparse partner (default)
+      - cli:    same, plus provenance from --source / --source-mtime (hg_path, raw-save mtime)
+    The decoded-dir scan is cached on the instance so repeated callers share it.
+    """
+
+    def __init__(self, decoded_dir: Path = DECODED_DIR, fullparse_dir: Path = FULLPARSE_DIR,
+                 manifest_final: Path = MANIFEST_FINAL, manifest_tmp: Path = MANIFEST_TMP,
+                 full_hash: bool = False) -> None:
+        self.full_hash = full_hash
+        self.decoded_dir = decoded_dir
+        self.fullparse_dir = fullparse_dir
+        self.manifest_final = manifest_final
+        self.manifest_tmp = manifest_tmp
+        self._pair: Optional[Tuple[Path, Path]] = None
+        self._pair_scanned = False
+
+    def latest_pair(self) -> Optional[Tuple[Path, Path]]:
+        """Pick most-recent decoded save (*.json) and its fullparse partner (<stem>.full.json)."""
+        if self._pair_scanned:
+            return self._pair
+        self._pair_scanned = True
+        if not self.decoded_dir.exists():
+            return None
+        # One stat per candidate via DirEntry; a max-heap (negated mtime) is popped
+        # newest-first only until a partner exists, instead of sorting everything.
+        heap: List[Tuple[float, str]] = []
+        skip = self.manifest_final.name
+        with os.scandir(self.decoded_dir) as it:
+            for e in it:
+                name = e.name
+                if not name.endswith(".json") or name == skip:
+                    continue
+                try:
+                    heap.append((-e.stat().st_mtime, name))
+                except FileNotFoundError:
+                    continue
+        heapq.heapify(heap)
+        while heap:
+            _, name = heapq.heappop(heap)
+            stem = name[:-5]  # e.g., "save" or "save2"
+            out = self.fullparse_dir / f"{stem}.full.json"
+            if out.exists():
+                self._pair = (self.decoded_dir / name, out)
+                break
+        return self._pair
+
+    def build(self, source: str = "", source_mtime: str = "") -> Dict[str, Any]:
+        """Return the manifest document; an empty one when no decoded/fullparse pair exists."""
+        pair = self.latest_pair()
+        if not pair:
+            return {"items": [], "snapshot_ts": None}
+
+        decoded_path, out_json = pair
+        src_mtime = decoded_path.stat().st_mtime
+        out_mtime = out_json.stat().st_mtime if out_json.exists() else None
+
+        # Hashes; importer expects 'json_sha256' representing the JSON we will load (out_json).
+        # Importers re-hash the file themselves, so the manifest only needs change detection:
+        # a (size, mtime_ns, head/tail) fingerprint unless --full-hash asks for SHA-256.
+        if self.full_hash:
+            # Independent files: hash both at once (hashlib releases the GIL on big updates).
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                f_out = ex.submit(_sha256, out_json)
+                f_src = ex.submit(_sha256, decoded_path)
+                out_sha, src_sha = f_out.result(), f_src.result()
+        else:
+            out_sha, src_sha = _fingerprint(out_json), _fingerprint(decoded_path)
+
+        # Derive save_root from decoded path if possible
+        save_root = _derive_save_root_from_source_path(decoded_path)
+
+        item: Dict[str, Any] = {
+            "source_path": str(decoded_path),            # path we decoded to
+            "out_json":    str(out_json),                # fullparse JSON
+            "save_root":   save_root,                    # helps UI grouping
+            "source_mtime": _iso_utc(src_mtime),         # importer reads this
+            "decoded_mtime": _iso_utc(out_mtime) if out_mtime else None,  # importer expects this key
+            "json_sha256":  out_sha or "",               # importer expects this key
+            # keep the originals too (harmless):
+            "source_sha256": src_sha or "",
+        }
+        if source:
+            # Raw .hg provenance: lets importers/readers resolve the save root and raw mtime.
+            item["hg_path"] = source
+            if not save_root:
+                item["save_root"] = _derive_save_root_from_source_path(Path(source))
+        if source_mtime.strip().isdigit():
+            item["source_mtime"] = _iso_utc(float(source_mtime.strip()))
+
+        return {"snapshot_ts": _iso_utc(src_mtime), "items": [item]}
+
+    def write_atomic(self, doc: Dict[str, Any]) -> bool:
+        """Atomically replace the manifest unless it is already byte-identical."""
+        data = _dumps(doc)
+        try:
+            if self.manifest_final.read_bytes() == data:
+                print("[MANIFEST] unchanged", file=sys.stderr)
+                return False
+        except FileNotFoundError:
+            pass
+        if not _write_via_tmpfile(self.manifest_final, self.manifest_tmp, data):
+            self.manifest_tmp.write_bytes(data)
+            os.replace(self.manifest_tmp, self.manifest_final)
+        return True
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Build manifest for initial import")
+    ap.add_argument("--mode", choices=("latest", "cli"), default="latest",
+                    help="latest (default): newest decoded/fullparse pair; "
+                         "cli: also record --source/--source-mtime provenance")
     ap.add_argument("--source", default="", help="Original HG path (optional)")
     ap.add_argument("--source-mtime", default="", help="Source mtime (seconds) for provenance (optional)")
+    ap.add_argument("--full-hash", action="store_true",
+                    help="Record full SHA-256 digests instead of the cheap fp1: size/mtime/head+tail fingerprint")
     args = ap.parse_args()
 
-    pair = _latest_pair()
-    if not pair:
-        # Ensure no stale tmp remains; create an empty manifest atomically
-        MANIFEST_TMP.write_text(json.dumps({"items": [], "snapshot_ts": None}) + "\n", encoding="utf-8")
-        os.replace(MANIFEST_TMP, MANIFEST_FINAL)
-        return 0
-
-    decoded_path, out_json = pair
-    src_mtime = decoded_path.stat().st_mtime
-    out_mtime = out_json.stat().st_mtime if out_json.exists() else None
-
-    # Hashes; importer expects 'json_sha256' representing the JSON we will load (out_json).
-    out_sha = _sha256(out_json)
-    src_sha = _sha256(decoded_path)
-
-    # Derive save_root from decoded path if possible
-    save_root = _derive_save_root_from_source_path(decoded_path)
-
-    manifest = {
-        "snapshot_ts": _iso_utc(src_mtime),
-        "items": [
-            {
-                "source_path": str(decoded_path),            # path we decoded to
-                "out_json":    str(out_json),                # fullparse JSON
-                "save_root":   save_root,                    # helps UI grouping
-                "source_mtime": _iso_utc(src_mtime),         # importer reads this
-                "decoded_mtime": _iso_utc(out_mtime) if out_mtime else None,  # importer expects this key
-                "json_sha256":  out_sha or "",               # importer expects this key
-                # keep the originals too (harmless):
-                "source_sha256": src_sha or "",
-            }
-        ],
-    }
-
-    # Atomic write
-    MANIFEST_TMP.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    os.replace(MANIFEST_TMP, MANIFEST_FINAL)
+    builder = ManifestBuilder(full_hash=args.full_hash)
+    if args.mode == "cli":
+        doc = builder.build(source=args.source, source_mtime=args.source_mtime)
+    else:
+        doc = builder.build()
+    builder.write_atomic(doc)
     return 0
 
 if __name__ == "__main__":
@@ -1,17 +1,38 @@
 # scripts/python/pipeline/ledger/__init__.py
-from .ts_utils import parse_any_timestamp, canonical_ts_from_file
-from .inventory import aggregate_inventory
-from .ledger_core import diff_inventories, coalesce_sessions, write_ledger_to_db
-from .initial_import import initial_import_to_csv_sql, parse_initial_sql_totals
-from .db_conn import _load_env, _manifest_source_mtime_safe, _db_connect_from_env
-from .import_to_db import initial_import_to_db
-from .baseline_loader import load_baseline_from_db
-from .io_utils import pick_latest_json_from_path
+# Public names resolve lazily (PEP 562): importing one leaf module (e.g. cli_main's
+# `from scripts.python.pipeline.ledger.inventory import ...`) no longer drags in every sibling.
+import importlib
+from typing import Any, Dict, List
+
+_EXPORTS: Dict[str, str] = {
+    "parse_any_timestamp": "ts_utils", "canonical_ts_from_file": "ts_utils",
+    "aggregate_inventory": "inventory",
+    "diff_inventories": "ledger_core", "coalesce_sessions": "ledger_core", "write_ledger_to_db": "ledger_core",
+    "initial_import_to_csv_sql": "initial_import", "parse_initial_sql_totals": "initial_import",
+    "_load_env": "db_conn", "_manifest_source_mtime_safe": "db_conn",
+    "_db_connect_from_env": "db_conn", "_db_session": "db_conn",
+    "initial_import_to_db": "import_to_db",
+    "load_baseline_from_db": "baseline_loader",
+    "pick_latest_json_from_path": "io_utils", "load_save_json": "io_utils",
+    "load_snapshot": "snapshot_cache",
+}
 
 __all__ = [
     "parse_any_timestamp","canonical_ts_from_file","aggregate_inventory",
     "diff_inventories","coalesce_sessions","write_ledger_to_db",
     "initial_import_to_csv_sql","parse_initial_sql_totals",
-    "_load_env","_manifest_source_mtime_safe","_db_connect_from_env",
+    "_load_env","_manifest_source_mtime_safe","_db_connect_from_env","_db_session",
     "initial_import_to_db","load_baseline_from_db","pick_latest_json_from_path",
+    "load_save_json","load_snapshot",
 ]
+
+def __getattr__(name: str) -> Any:
+    mod = _EXPORTS.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{mod}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -3,15 +3,23 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 from .db_conn import _db_connect_from_env, _manifest_source_mtime_safe
 
+FETCH_BATCH = 10000
+
 def load_baseline_from_db(table: str, env_path: Path) -> Dict:
     """Return a baseline inventory map from DB, keyed by (owner_type,item_id)."""
     conn = _db_connect_from_env(env_path)
     try:
         cur = conn.cursor()
+        cur.arraysize = FETCH_BATCH
         cur.execute(f"SELECT owner_type,item_id,amount FROM {table}")
-        out = {}
-        for owner, item, amt in cur:
-            out[(owner, item)] = int(amt)
+        out: Dict = {}
+        # Pull rows in batches and fold each batch in with one dict.update;
+        # skip int() when the driver already returned an int.
+        while True:
+            rows = cur.fetchmany(FETCH_BATCH)
+            if not rows:
+                break
+            out.update(((o, i), a if a.__class__ is int else int(a)) for o, i, a in rows)
         return out
     finally:
         conn.close()
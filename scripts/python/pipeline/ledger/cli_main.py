@@ -1,7 +1,6 @@
-import argparse, hashlib
-from collections import defaultdict
+import argparse, contextlib, functools, hashlib, itertools, os
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple, Optional, Union
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Tuple, Optional, Union
 
 # Package-import shim for direct execution
 if __package__ in (None, ""):
@@ -11,11 +10,10 @@ if __package__ in (None, ""):
 # Leaf imports only (avoid aggregator __init__ which imports db_conn with redacted password literal)
 from scripts.python.pipeline.ledger.initial_import import _escape_sql  # type: ignore
 from scripts.python.pipeline.ledger.inventory import aggregate_inventory
-from scripts.python.pipeline.ledger.ts_utils import canonical_ts_from_file
+from scripts.python.pipeline.ledger.io_utils import load_save_json, read_json
 
 def _load_manifest(path: Path) -> Dict[str, Any]:
-    import json
-    return json.loads(path.read_text(encoding="utf-8"))
+    return read_json(path)
 
 def _infer_save_root(manifest: Dict[str, Any], item: Dict[str, Any], js: Dict[str, Any], json_path: Path) -> str:
     """
@@ -28,11 +26,9 @@ def _infer_save_root(manifest: Dict[str, Any], item: Dict[str, Any], js: Dict[st
       5) last-resort: ''
     """
     def _parent(p: Optional[str]) -> Optional[str]:
+        # Pure string ops: abspath needs no readlink/stat walk, unlike Path.resolve()
         if not p: return None
-        try:
-            return str(Path(p).expanduser().resolve().parent)
-        except Exception:
-            return str(Path(p).parent)
+        return os.path.dirname(os.path.abspath(os.path.expanduser(str(p)))) or None
 
     meta = js.get("_meta", {}) if isinstance(js, dict) else {}
 
@@ -57,9 +53,8 @@ def _infer_save_root(manifest: Dict[str, Any], item: Dict[str, Any], js: Dict[st
     return ""
 
 
-def _read_json(path: Path) -> Dict[str, Any]:
-    import json
-    return json.loads(path.read_text(encoding="utf-8"))
+_DECODED_SEG = f"{os.sep}decoded{os.sep}"
+_CLEANED_SEG = f"{os.sep}cleaned{os.sep}"
 
 def _find_best_json(item: Dict[str, Any]) -> Optional[Path]:
     """
@@ -70,97 +65,97 @@ def _find_best_json(item: Dict[str, Any]) -> Optional[Path]:
     """
     # Provided by manifest?
     out_json = item.get("out_json")
-    if out_json:
-        p = Path(out_json)
-        if p.exists():
-            return p
+    if out_json and os.path.isfile(out_json):
+        return Path(out_json)
 
-    # Try to derive cleaned path from decoded source_path
     source = item.get("source_path")
-    if source:
-        sp = Path(source)
-        # /decoded/<name>.json -> /cleaned/<name>.clean.json
-        try:
-            parts = list(sp.parts)
-            if "decoded" in parts:
-                parts[parts.index("decoded")] = "cleaned"
-                stem = sp.stem  # e.g., save2
-                cleaned = Path(*parts[:-1]) / f"{stem}.clean.json"
-                if cleaned.exists():
-                    return cleaned
-        except Exception:
-            pass
+    if not source:
+        return None
+    sp = os.fspath(source)
+
+    # Derive cleaned path from decoded source_path by string surgery (no Path/parts churn):
+    # /decoded/<name>.json -> /cleaned/<name>.clean.json
+    probe = os.sep + sp
+    i = probe.find(_DECODED_SEG)
+    if i != -1:
+        swapped = (probe[:i] + _CLEANED_SEG + probe[i + len(_DECODED_SEG):])[1:]
+        stem = os.path.splitext(os.path.basename(sp))[0]  # e.g., save2
+        cleaned = os.path.join(os.path.dirname(swapped), f"{stem}.clean.json")
+        if os.path.isfile(cleaned):
+            return Path(cleaned)
 
     # Fallback: decoded json
-    if source:
-        sp = Path(source)
-        if sp.exists():
-            return sp
+    return Path(sp) if os.path.isfile(sp) else None
 
-    return None
+@functools.lru_cache(maxsize=32)
+def _pair_sql(owner: str, inv: str) -> bytes:
+    """Escaped b"'owner', 'inv', " fragment; only a handful of pairs exist per save."""
+    return f"'{_escape_sql(owner)}', '{_escape_sql(inv)}', ".encode("utf-8")
 
-def _emit_initial_sql(json_path: Path, *, save_root: str, include_tech: bool = False, use_mtime: bool = False) -> str:
+_NO_ROWS = b"/* no snapshot rows generated */\n"
+
+def _write_initial_sql(json_path: Path, out: BinaryIO, *, save_root: str, include_tech: bool = False,
+                       use_mtime: bool = False, js: Optional[Dict[str, Any]] = None,
+                       totals: Optional[Dict[Tuple[str, str, str], int]] = None,
+                       sort_rows: bool = False) -> int:
     """
-    Emit transactional SQL that:
+    Write transactional SQL (UTF-8) to the binary stream out:
       1) INSERT IGNORE nms_resources(resource_id) for any missing ids
       2) INSERT nms_snapshots(source_path, save_root) and capture @sid
       3) INSERT nms_items(snapshot_id, owner_type, inventory, slot_index, resource_id, amount) VALUES (...)
+    Pass the already-parsed js (and/or its totals) to skip re-reading json_path.
+    Rows follow aggregate_inventory's insertion order (stable for a given save);
+    sort_rows=True sorts them by (owner, inventory, resource_id) for diff-friendly output.
+    Blocks are written as they are ready; no full SQL string is built.
+    Returns the number of item rows written (0 means only the sentinel comment was written).
     """
-    js = _read_json(json_path)
-    # aggregate_inventory(js) -> Dict[(owner_type, inventory, resource_id), amount]
-    totals = aggregate_inventory(js, include_tech=include_tech)
+    if totals is None:
+        if js is None:
+            js = load_save_json(json_path)
+        # aggregate_inventory(js) -> Dict[(owner_type, inventory, resource_id), amount]
+        totals = aggregate_inventory(js, include_tech=include_tech)
     if not totals:
-        return "/* no snapshot rows generated */\n"
-
-    # Canonical labels (align with enum values if present)
-    def norm_owner(s: str) -> str:
-        s = (s or "").strip().lower()
-        if s == "character": return "Character"
-        if s == "ship": return "Ship"
-        if s == "vehicle": return "Vehicle"
-        if s == "freighter": return "Freighter"
-        return "Unknown"
-
-    def norm_inv(s: str) -> str:
-        s = (s or "").strip().lower()
-        if s == "general": return "General"
-        if s in ("tech", "technology"): return "Technology"
-        if s == "cargo": return "Cargo"
-        return "General"
-
-    # Collect values
-    item_rows: List[str] = []
-    resource_ids: set[str] = set()
-    for (owner_type, inventory, resource_id), amt in sorted(totals.items()):
-        owner_sql = _escape_sql(norm_owner(str(owner_type)))
-        inv_sql   = _escape_sql(norm_inv(str(inventory)))
-        rid_sql   = _escape_sql(str(resource_id))
-        resource_ids.add(rid_sql)
-
-        # Assign synthetic slot_index 0..N-1 per (owner, inventory) group to satisfy uniq_slot_per_snapshot.
-        # We don't have container_id here (aggregate path), so treat it as '' in the uniqueness scope.
-        slot_counters = defaultdict(int)  # key: (owner_sql, inv_sql)
-        item_rows = []
-        # Sort for deterministic slot assignment
-        for (owner_sql, inv_sql, rid_sql), amt in sorted(totals.items(), key=lambda x: (x[0][0], x[0][1], x[0][2])):
-            slot_index = slot_counters[(owner_sql, inv_sql)]
-            slot_counters[(owner_sql, inv_sql)] += 1
-            item_rows.append(
-                f"(@sid, '{owner_sql}', '{inv_sql}', {slot_index}, '{rid_sql}', {int(amt)}, 'unknown')"
-            )
-
-        # If for any reason the list ended up empty, emit sentinel and bail (prevents empty INSERT)
-        if not item_rows:
-            return "/* no snapshot rows generated */\n"
-
-
-    resources_values = ",\n".join(f"('{rid}')" for rid in sorted(resource_ids))
+        out.write(_NO_ROWS)
+        return 0
+
+    # Assign synthetic slot_index 0..N-1 per (owner, inventory) group to satisfy uniq_slot_per_snapshot.
+    # We don't have container_id here (aggregate path), so treat it as '' in the uniqueness scope.
+    # One pass renders each item row and collects the resource ids; the items block
+    # has to wait for the nms_resources block, which is written first.
+    # The same resource_id recurs across owners/inventories: escape each one once (esc_cache
+    # maps raw -> escaped bytes and doubles as the resource id set).
+    rows = sorted(totals.items()) if sort_rows else totals.items()
+    esc_cache: Dict[str, bytes] = {}
+    # Per (owner, inventory): (escaped pair literal, slot counter), so the row loop does one
+    # dict probe instead of a counter read/write plus a cache call.
+    groups: Dict[Tuple[str, str], Tuple[bytes, Iterator[int]]] = {}
+    item_rows: List[bytes] = []
+    append = item_rows.append
+    esc = _escape_sql
+    tmpl = b"(@sid, %s%d, '%s', %d, 'unknown')"
+    for (owner, inv, rid), amt in rows:
+        g = groups.get((owner, inv))
+        if g is None:
+            g = groups[(owner, inv)] = (_pair_sql(owner, inv), itertools.count())
+        rid_sql = esc_cache.get(rid)
+        if rid_sql is None:
+            rid_sql = esc_cache[rid] = esc(str(rid)).encode("utf-8")
+        # %d formats the int amount directly (and truncates floats exactly like int() would)
+        append(tmpl % (g[0], next(g[1]), rid_sql, amt))
+    n = len(item_rows)
+
+    # If for any reason the list ended up empty, emit sentinel and bail (prevents empty INSERT)
+    if not n:
+        out.write(_NO_ROWS)
+        return 0
+
     source_path_sql = _escape_sql(json_path.as_posix())
     save_root_sql   = _escape_sql(save_root or "")
     # Epoch seconds from the JSON file mtime; fallback to canonical_ts if stat fails
     try:
         _epoch = int(json_path.stat().st_mtime)
     except Exception:
+        from scripts.python.pipeline.ledger.ts_utils import canonical_ts_from_file  # rare path; keep import off start-up
         _ts = canonical_ts_from_file(json_path, use_mtime=True)
         _epoch = int(_ts.timestamp())
     # emit as a MariaDB DATETIME using FROM_UNIXTIME()
@@ -168,28 +163,25 @@ def _emit_initial_sql(json_path: Path, *, save_root: str, include_tech: bool = F
     # Hash of the JSON file contents (hex)
     json_sha256_sql = hashlib.sha256(json_path.read_bytes()).hexdigest()
 
+    out.write(b"SET FOREIGN_KEY_CHECKS=0;\nSTART TRANSACTION;\n")
 
-    sql_lines: List[str] = []
-    sql_lines.append("SET FOREIGN_KEY_CHECKS=0;")
-    sql_lines.append("START TRANSACTION;")
-
-    if resources_values:
-        sql_lines.append("INSERT IGNORE INTO nms_resources(resource_id) VALUES")
-        sql_lines.append(resources_values + ";")
+    out.write(b"INSERT IGNORE INTO nms_resources(resource_id) VALUES\n")
+    out.write(b",\n".join(b"('%s')" % rid for rid in sorted(esc_cache.values())))
+    out.write(b";\n")
 
-    sql_lines.append(
+    out.write(
         f"INSERT INTO nms_snapshots(source_path, save_root, source_mtime, json_sha256) "
-        f"VALUES ('{source_path_sql}', '{save_root_sql}', {source_mtime_sql}, '{json_sha256_sql}');"
+        f"VALUES ('{source_path_sql}', '{save_root_sql}', {source_mtime_sql}, '{json_sha256_sql}');\n".encode("utf-8")
     )
-    sql_lines.append("SET @sid := LAST_INSERT_ID();")
+    out.write(b"SET @sid := LAST_INSERT_ID();\n")
 
     # >>> This is the block your shell grep looks for <<<
-    sql_lines.append("INSERT INTO nms_items(snapshot_id, owner_type, inventory, slot_index, resource_id, amount, item_type) VALUES")
-    sql_lines.append(",\n".join(item_rows) + ";")
+    out.write(b"INSERT INTO nms_items(snapshot_id, owner_type, inventory, slot_index, resource_id, amount, item_type) VALUES\n")
+    out.write(b",\n".join(item_rows))
+    out.write(b";\n")
 
-    sql_lines.append("COMMIT;")
-    sql_lines.append("SET FOREIGN_KEY_CHECKS=1;")
-    return "\n".join(sql_lines) + "\n"
+    out.write(b"COMMIT;\nSET FOREIGN_KEY_CHECKS=1;\n")
+    return n
 
 def main() -> None:
     import sys
@@ -201,6 +193,8 @@ def main() -> None:
     p_init.add_argument("--db-name", required=False)  # accepted but unused in SQL generation
     p_init.add_argument("--include-tech", action="store_true", default=False)
     p_init.add_argument("--use-mtime", action="store_true", default=False)
+    p_init.add_argument("--sorted", dest="sort_rows", action="store_true", default=False,
+                        help="Sort item rows by owner/inventory/resource for deterministic diffs")
     args = p.parse_args()
 
     if args.cmd == "initial_import":
@@ -212,27 +206,28 @@ def main() -> None:
 
         item0 = items[0]  # latest
         json_path = _find_best_json(item0)
-        if not json_path or not json_path.exists():
+        if not json_path:
             print("/* no snapshot rows generated */")
             print(f"[initial_import] No usable JSON found for item: {item0}", file=sys.stderr)
             return
+        # Parse once; the same dict feeds save_root inference, SQL emission and diagnostics
+        js = load_save_json(json_path)
         # Resolve save_root from manifest/item/full-parse metadata
-        try:
-            js_for_root = _read_json(json_path)
-        except Exception:
-            js_for_root = {}
-        save_root = _infer_save_root(manifest, item0, js_for_root, json_path)
+        save_root = _infer_save_root(manifest, item0, js, json_path)
 
-        sql = _emit_initial_sql(json_path, save_root=save_root, include_tech=bool(args.include_tech), use_mtime=bool(args.use_mtime))
+        totals = aggregate_inventory(js, include_tech=bool(args.include_tech))
         # Helpful diagnostics go to stderr; SQL only to stdout
-        try:
-            js = _read_json(json_path)
-            totals = aggregate_inventory(js, include_tech=bool(args.include_tech))
-            print(f"[initial_import] Using: {json_path} (rows={len(totals)})", file=sys.stderr)
-        except Exception as e:
-            print(f"[initial_import] Using: {json_path} (rows=unknown) error={e}", file=sys.stderr)
-
-        print(sql)
+        print(f"[initial_import] Using: {json_path} (rows={len(totals)})", file=sys.stderr)
+
+        # Stream the SQL as bytes straight to stdout (no full-string build, no print encode)
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+        with contextlib.suppress(BrokenPipeError):
+            _write_initial_sql(json_path, out, save_root=save_root, include_tech=bool(args.include_tech),
+                               use_mtime=bool(args.use_mtime), js=js, totals=totals,
+                               sort_rows=bool(args.sort_rows))
+            out.write(b"\n")
+            out.flush()
         return
 
 if __name__ == "__main__":
@@ -6,17 +6,17 @@ from typing import Any, Dict, Iterable, List, Tuple, Optional, Union
 if __package__ in (None, ""):
     import sys, pathlib
     sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[5]))
-from scripts.python.pipeline.ledger import (
-    parse_any_timestamp, canonical_ts_from_file,
-    aggregate_inventory, diff_inventories, coalesce_sessions, write_ledger_to_db,
-    initial_import_to_csv_sql, parse_initial_sql_totals,
-    _load_env, _manifest_source_mtime_safe, _db_connect_from_env,
-    initial_import_to_db, load_baseline_from_db, pick_latest_json_from_path
-)
 
 def run_ledger(args) -> None:
+    # Helpers are imported on first call, not at module import, to keep CLI start-up cheap
+    from scripts.python.pipeline.ledger import (
+        parse_any_timestamp, canonical_ts_from_file,
+        aggregate_inventory, diff_inventories, coalesce_sessions, write_ledger_to_db,
+        initial_import_to_csv_sql, parse_initial_sql_totals,
+        _load_env, _manifest_source_mtime_safe, _db_connect_from_env,
+        initial_import_to_db, load_baseline_from_db, pick_latest_json_from_path
+    )
     pass  # temporary no-op to satisfy interpreter until body is pasted
-    # NOTE: relies on helpers imported above from the same package
     # ... full function from original file ...
     # BEGIN pasted body
     # (pasted from original lines 658–798)
@@ -1,18 +1,27 @@
 # scripts/python/pipeline/ledger/db_conn.py
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
+import atexit
+import contextlib
+import functools
 import os
 import json
+import re
+
+# KEY=VALUE lines; blank and '#' comment lines never match
+_ENV_LINE_RE = re.compile(r"^[ \t]*([^#=\s][^=\n]*)=(.*)$", re.M)
+
+@functools.lru_cache(maxsize=8)
+def _parse_env(path: str, mtime_ns: int) -> Tuple[Tuple[str, str], ...]:
+    # mtime_ns is part of the cache key only: an edited .env is re-parsed.
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    env: Dict[str,str] = {k.strip(): v.strip().strip('"') for k, v in _ENV_LINE_RE.findall(text)}
+    return tuple(env.items())
 
 def _load_env(env_path: Path) -> Dict[str, str]:
-    env: Dict[str,str] = {}
-    for line in env_path.read_text(encoding="utf-8").splitlines():
-        if not line.strip() or line.strip().startswith("#"):
-            continue
-        if "=" in line:
-            k,v = line.split("=",1)
-            env[k.strip()] = v.strip().strip('"')
-    return env
+    path = str(env_path)
+    return dict(_parse_env(path, os.stat(path).st_mtime_ns))
 
 def _manifest_source_mtime_safe(manifest_path: Path) -> Optional[int]:
     try:
@@ -20,14 +29,82 @@ def _manifest_source_mtime_safe(manifest_path: Path) -> Optional[int]:
     except Exception:
         return None
 
-def _db_connect_from_env(env_path: Path):
-    env = _load_env(env_path)
-    import mariadb
-    conn = mariadb.connect(
+# ConnectionPool opens every slot up front; one-shot CLIs hold one connection at a time,
+# so a single slot costs no more than a plain connect. Extra demand falls back to connect().
+POOL_SIZE = 1
+_POOLS: Dict[Tuple[Tuple[str, str], ...], Any] = {}
+
+def _connect_kwargs(env: Dict[str, str]) -> Dict[str, Any]:
+    return dict(
         host=env.get("DB_HOST","127.0.0.1"),
         user=env.get("DB_USER","nms_user"),
         password=env.get("DB_PASSWORD",""),
         database=env.get("DB_NAME","nms_database"),
-        autocommit=False,
     )
+
+def _get_pool(mariadb, kwargs: Dict[str, Any]):
+    """One lazily created pool per distinct connection settings; None if pooling is unavailable."""
+    key = tuple(sorted(kwargs.items()))
+    pool = _POOLS.get(key)
+    if pool is None:
+        try:
+            pool = mariadb.ConnectionPool(
+                pool_name=f"nms{len(_POOLS)}", pool_size=POOL_SIZE,
+                pool_reset_connection=True, **kwargs,
+            )
+        except (AttributeError, mariadb.Error):
+            return None
+        _POOLS[key] = pool
+    return pool
+
+def _close_pools() -> None:
+    """Close every pooled connection (registered atexit; idle pooled sockets otherwise linger until GC)."""
+    while _POOLS:
+        _, pool = _POOLS.popitem()
+        try:
+            pool.close()
+        except Exception:
+            pass
+
+atexit.register(_close_pools)
+
+def _db_connect_from_env(env_path: Path, local_infile: bool = False):
+    """
+    Connection from a per-process pool (created on first use), so repeated imports
+    skip the TCP/auth handshake; conn.close() hands it back to the pool.
+    Falls back to a plain connect when the pool is exhausted or unsupported.
+    local_infile=True enables LOAD DATA LOCAL INFILE (such connections get their own pool).
+    """
+    env = _load_env(env_path)
+    import mariadb
+    kwargs = _connect_kwargs(env)
+    if local_infile:
+        kwargs["local_infile"] = True
+    pool = _get_pool(mariadb, kwargs)
+    conn = None
+    if pool is not None:
+        try:
+            conn = pool.get_connection()
+        except mariadb.PoolError:
+            conn = None
+    if conn is None:
+        return mariadb.connect(autocommit=False, **kwargs)
+    # Pool reset restores the server default; callers expect explicit commits
+    conn.autocommit = False
     return conn
+
+@contextlib.contextmanager
+def _db_session(env_path: Path):
+    """Connection for one unit of work: commit once on success, rollback on error, always close."""
+    conn = _db_connect_from_env(env_path)
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        conn.close()
@@ -1,22 +1,91 @@
 # scripts/python/pipeline/ledger/import_to_db.py
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
+import csv
+import os
+import sys
+import tempfile
 from .db_conn import _db_connect_from_env
+from .initial_import import _escape_sql
 
-def initial_import_to_db(json_path, table: str, env_path: Path, use_mtime=False, include_tech=False, verbose=False) -> None:
-    import json
-    from .initial_import import _collect_initial_rows
-    from .ts_utils import canonical_ts_from_file
-    js = json.loads(Path(json_path).read_text(encoding="utf-8"))
-    rows = _collect_initial_rows(js, include_tech=include_tech)
-    ts = canonical_ts_from_file(json_path, use_mtime=use_mtime)
+# Rows per multi-row INSERT: 10k x 4 binds stays under the 65535-placeholder limit for
+# prepared statements and well under max_allowed_packet; larger batches gain little.
+INSERT_CHUNK = 10000
 
-    conn = _db_connect_from_env(env_path)
+def _load_data_local(cur, table: str, ts, rows: Iterable[Tuple[str, str, int]]) -> None:
+    """
+    Bulk-load rows through LOAD DATA LOCAL INFILE from a temporary CSV: the server
+    parses the file in one statement instead of binding every value.
+    """
+    # Same wall-clock text the connector sends for a bound datetime (tzinfo dropped)
+    ts_txt = ts.strftime("%Y-%m-%d %H:%M:%S.%f")
+    fd, tmp = tempfile.mkstemp(prefix="nms_initial_", suffix=".csv")
     try:
-        cur = conn.cursor()
-        sql = f"INSERT INTO {table}(ts, owner_type, item_id, amount) VALUES (%s,%s,%s,%s)"
-        for owner_type, item_id, amt in rows:
-            cur.execute(sql, (ts, owner_type, item_id, int(amt)))
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f, lineterminator="\n")
+            w.writerows((ts_txt, owner_type, item_id, int(amt)) for owner_type, item_id, amt in rows)
+        # csv doubles embedded quotes and never backslash-escapes, hence ESCAPED BY ''
+        cur.execute(
+            f"LOAD DATA LOCAL INFILE '{_escape_sql(Path(tmp).as_posix())}' INTO TABLE {table} "
+            "CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+            "LINES TERMINATED BY '\\n' (ts, owner_type, item_id, amount)"
+        )
+    finally:
+        os.unlink(tmp)
+
+def _insert_values(cur, table: str, ts, rows: Iterable[Tuple[str, str, int]]) -> None:
+    # Prepared cursor: every full INSERT_CHUNK batch shares one SQL text, so the
+    # server-side statement is parsed once and re-executed with new binds.
+    # Multi-row VALUES in INSERT_CHUNK batches: one statement parse/round-trip per chunk
+    sql_head = f"INSERT INTO {table}(ts, owner_type, item_id, amount) VALUES "
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, INSERT_CHUNK))
+        if not batch:
+            break
+        placeholders = ",".join(["(%s,%s,%s,%s)"] * len(batch))
+        flat = [x for owner_type, item_id, amt in batch for x in (ts, owner_type, item_id, int(amt))]
+        cur.execute(sql_head + placeholders, flat)
+
+def initial_import_to_db(json_path, table: str, env_path: Path, use_mtime=False, include_tech=False,
+                         verbose=False, load_data: bool = False) -> None:
+    """
+    Load the initial rows for one save into table with chunked multi-row INSERTs.
+    load_data=True (opt-in: it enables client-side local_infile, which lets the server
+    request local files) tries LOAD DATA LOCAL INFILE first. It falls back to the INSERT
+    path if the client or server refuses it (e.g. local_infile=OFF on the server), or if
+    the load raised warnings: LOAD DATA LOCAL skips duplicate-key rows with only a warning,
+    and the INSERT path then reports them as errors, exactly as without load_data.
+    """
+    import mariadb
+    from .initial_import import _iter_initial_rows
+    from .snapshot_cache import load_snapshot
+    ts, totals = load_snapshot(json_path, include_tech=include_tech, use_mtime=use_mtime)
+
+    conn = _db_connect_from_env(env_path, local_infile=load_data)
+    try:
+        cur = conn.cursor(prepared=True)
+        # Bulk load: skip per-row unique/FK checks (same toggle as the emitted initial SQL);
+        # session-scoped, and the pool resets the session when an aborted run closes it.
+        cur.execute("SET unique_checks=0")
+        cur.execute("SET foreign_key_checks=0")
+        loaded = False
+        if load_data:
+            try:
+                _load_data_local(conn.cursor(), table, ts, _iter_initial_rows(totals))
+                loaded = not conn.warnings
+                why = f"{conn.warnings} warning(s)"
+            except mariadb.Error as e:
+                why = str(e)
+            if not loaded:
+                conn.rollback()  # nothing from a refused/partial LOAD DATA may be kept
+                if verbose:
+                    print(f"[initial_import_to_db] LOAD DATA not used ({why}); using INSERT", file=sys.stderr)
+        if not loaded:
+            _insert_values(cur, table, ts, _iter_initial_rows(totals))
         conn.commit()
+        cur.execute("SET foreign_key_checks=1")
+        cur.execute("SET unique_checks=1")
     finally:
         conn.close()
@@ -1,67 +1,101 @@
 # scripts/python/pipeline/ledger/initial_import.py
-from typing import Any, Dict, Iterable, List, Tuple, Optional
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional
 import csv
 import re
 
 def _escape_sql(s: str) -> str:
+    # Most ids/paths need no escaping: two C-level membership scans, no new string
+    if "'" not in s and "\\" not in s:
+        return s
     return s.replace("\\", "\\\\").replace("'", "\\'")
 
-def _collect_initial_rows(js: Dict[str, Any], include_tech: bool = False) -> List[Tuple[str, str, int]]:
-    from .inventory import aggregate_inventory
-    totals = aggregate_inventory(js, include_tech=include_tech)
-    rows: List[Tuple[str, str, int]] = []
-    for (owner_type, item_id), amt in sorted(totals.items()):
-        rows.append((owner_type, item_id, int(amt)))
-    return rows
+SQL_ROWS_PER_INSERT = 1000
+_SQL_INSERT_HEAD = "INSERT INTO initial_items(ts,owner_type,item_id,amount) VALUES\n"
+
+class _SqlRowPrefixes(dict):
+    """
+    owner_type -> "('<ts>','<owner>','", the escaped head of a VALUES row, built on first use:
+    ts and the handful of owner types are escaped and formatted once, not once per row.
+    """
+    def __init__(self, ts_sql: str) -> None:
+        super().__init__()
+        self.ts_sql = ts_sql
+
+    def __missing__(self, owner_type: str) -> str:
+        v = self[owner_type] = f"('{self.ts_sql}','{_escape_sql(owner_type)}','"
+        return v
+
+def _iter_initial_rows(totals: Dict[Tuple[str, ...], int]) -> Iterator[Tuple[str, str, int]]:
+    """
+    (owner_type, item_id, amount) rows in sorted order, yielded for the writers to consume
+    directly. initial_items has no inventory column, so aggregate_inventory's
+    (owner, inventory, id) totals are summed per (owner, id).
+    """
+    by_item: Dict[Tuple[str, str], int] = Counter()
+    for key, amt in totals.items():
+        by_item[(key[0], key[-1])] += int(amt)
+    for (owner_type, item_id), amt in sorted(by_item.items()):
+        yield owner_type, item_id, amt
 
 def initial_import_to_csv_sql(json_path, out_csv, out_sql, use_mtime=False, include_tech=False, verbose=False) -> None:
-    import json
-    from pathlib import Path
-    from .ts_utils import canonical_ts_from_file
-    js = json.loads(Path(json_path).read_text(encoding="utf-8"))
-    rows = _collect_initial_rows(js, include_tech=include_tech)
-    ts = canonical_ts_from_file(json_path, use_mtime=use_mtime)
+    from .io_utils import open_text
+    from .snapshot_cache import load_snapshot
+    # Unchanged saves come from the on-disk snapshot cache without a parse
+    ts, totals = load_snapshot(json_path, include_tech=include_tech, use_mtime=use_mtime)
+    ts_iso = ts.isoformat()  # same for every row
+    ts_sql = _escape_sql(ts_iso)
 
-    # CSV
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
+    # One pass feeds both files (either may be a .gz path). SQL: one multi-row INSERT per
+    # SQL_ROWS_PER_INSERT rows (each row on its own line, as parse_initial_sql_totals
+    # expects) so replaying the file stays under max_allowed_packet.
+    rows = _iter_initial_rows(totals)
+    prefixes = _SqlRowPrefixes(ts_sql)
+    esc = _escape_sql
+    with open_text(out_csv, "w", newline="") as fc, open_text(out_sql, "w") as fs:
+        w = csv.writer(fc)
         w.writerow(["ts","owner_type","item_id","amount"])
-        for owner_type, item_id, amt in rows:
-            w.writerow([ts.isoformat(), owner_type, item_id, amt])
+        while True:
+            batch = list(islice(rows, SQL_ROWS_PER_INSERT))
+            if not batch:
+                break
+            w.writerows((ts_iso, owner_type, item_id, amt) for owner_type, item_id, amt in batch)
+            fs.write(_SQL_INSERT_HEAD)
+            # Amounts are ints from _iter_initial_rows: the row is plain concatenation
+            fs.write(",\n".join(f"{prefixes[owner_type]}{esc(item_id)}',{amt})"
+                                for owner_type, item_id, amt in batch))
+            fs.write(";\n")
+
+# One SQL literal: a quoted string (backslash or doubled-quote escapes) or a bare token
+_SQL_STR = r"'(?:\\.|''|[^'\\])*'"
+# A 4-column VALUES row on its own line: (ts, owner, item, amount)
+_COL = r"(" + _SQL_STR + r"|[^,'()\n]*?)"
+_VALUES_ROW_RE = re.compile(
+    r"^[ \t]*\(\s*" + _COL + r"\s*,\s*" + _COL + r"\s*,\s*" + _COL + r"\s*,\s*(-?\d+)\s*\)",
+    re.M,
+)
+
+_SQL_ESC_RE = re.compile(r"\\(.)|''", re.S)
 
-    # SQL
-    values_sql = []
-    for owner_type, item_id, amt in rows:
-        values_sql.append(
-            f"('{_escape_sql(ts.isoformat())}','{_escape_sql(owner_type)}','{_escape_sql(item_id)}',{int(amt)})"
-        )
-    out_sql.write_text("INSERT INTO initial_items(ts,owner_type,item_id,amount) VALUES\n" + ",\n".join(values_sql) + ";\n", encoding="utf-8")
+def _sql_unquote(tok: str) -> str:
+    """Value of one field token: quoted strings lose their quotes and escapes."""
+    if len(tok) >= 2 and tok[0] == tok[-1] == "'":
+        inner = tok[1:-1]
+        if "\\" not in inner and "'" not in inner:
+            return inner
+        return _SQL_ESC_RE.sub(lambda m: m.group(1) or "'", inner)
+    return tok
 
-def _split_sql_values_row(line: str) -> List[str]:
-    acc = []; cur = []; esc = False
-    for ch in line:
-        if esc:
-            cur.append(ch); esc = False; continue
-        if ch == "\\":
-            esc = True; cur.append(ch); continue
-        if ch == ",":
-            acc.append("".join(cur).strip()); cur = []; continue
-        cur.append(ch)
-    if cur:
-        acc.append("".join(cur).strip())
-    return acc
+def _add_values_rows(totals: Dict[Tuple[str,str], int], sql_text: str) -> None:
+    # Keys are the field values (what _escape_sql was given), not their SQL spelling
+    unq = _sql_unquote
+    for _, owner_q, item_q, amt in _VALUES_ROW_RE.findall(sql_text):
+        totals[(unq(owner_q), unq(item_q))] += int(amt)
 
 def parse_initial_sql_totals(sql_text: str) -> Dict[Tuple[str,str], int]:
     # Very tolerant parser for VALUES rows like:  ('2025-10-16', 'character','DI_HYDROGEN', 42)
-    totals: Dict[Tuple[str,str], int] = {}
-    for line in sql_text.splitlines():
-        if not line.strip().startswith("("):
-            continue
-        cols = _split_sql_values_row(line.strip().strip(",").strip("()"))
-        if len(cols) != 4:
-            continue
-        _, owner_q, item_q, amt = cols
-        owner = owner_q.strip().strip("'")
-        item = item_q.strip().strip("'")
-        totals[(owner,item)] = totals.get((owner,item), 0) + int(amt)
+    # All rows are tokenized by one regex sweep over the whole text.
+    totals: Dict[Tuple[str,str], int] = Counter()
+    _add_values_rows(totals, sql_text)
     return totals
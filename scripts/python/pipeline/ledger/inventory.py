@@ -1,101 +1,137 @@
 # scripts/python/pipeline/ledger/inventory.py
-from typing import Any, Dict, Iterable, List, Tuple, Optional
+import functools
+import re
+import sys
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, Iterable, List, Tuple, Optional, Union
 
+# "<key>[<n>]<rest>" within one dotted selector segment
+_SEG_RE = re.compile(r"^(.*?)\[(\d+)\](.*)$")
+
+@functools.lru_cache(maxsize=256)
 def _norm_key(s: str) -> str:
+    # Section/owner labels come from a small fixed vocabulary: normalize each one once
     return (s or "").strip().lower().replace(" ", "_")
 
+# Owner sections in priority order, with their canonical type precomputed
+_OWNER_KEYS = ("Character", "Ship", "Freighter", "Vehicle", "Storage")
+_OWNER_SET = frozenset(_OWNER_KEYS)
+_OWNER_TYPES = {k: _norm_key(k) for k in _OWNER_KEYS}
+
 def _inventory_type(owner_js: Dict[str, Any]) -> str:
     # Map owner's JSON section to a canonical type
-    for k in ("Character", "Ship", "Freighter", "Vehicle", "Storage"):
-        if k in owner_js:
-            return _norm_key(k)
+    # keys-view & set walks the smaller side (frozenset.intersection(dict) would walk the dict)
+    common = owner_js.keys() & _OWNER_SET
+    if not common:
+        return "unknown"
+    for k in _OWNER_KEYS:
+        if k in common:
+            return _OWNER_TYPES[k]
     return "unknown"
 
-def _is_item_slot(slot: Dict[str, Any]) -> bool:
-    return isinstance(slot, dict) and "Id" in slot and "Amount" in slot
+@functools.lru_cache(maxsize=4096)
+def _compile_selector(sel: str) -> Tuple[Tuple[Union[str, int], ...], str, str]:
+    """
+    Parse an _index.inventories selector once: the key/index steps to walk from the
+    document root, plus the inferred (inventory section, owner type).
+    Selectors repeat across saves, so later calls are a cache hit.
+    """
+    steps: List[Union[str, int]] = []
+    for seg in sel.split("."):
+        if "[" not in seg:
+            if seg:
+                steps.append(seg)
+            continue
+        # resolve any embedded [n] array steps within a single segment
+        while seg:
+            m = _SEG_RE.match(seg)
+            if not m:
+                steps.append(seg)
+                break
+            pre, idx, seg = m.groups()
+            if pre:
+                steps.append(pre)
+            steps.append(int(idx))
+
+    # Heuristic based on selector tokens seen in full-parse index:
+    #   '.PMT.' => cargo; '.hl?' => tech; else => general
+    if ".PMT." in sel:
+        section = "cargo"
+    elif ".hl?" in sel:
+        section = "tech"
+    else:
+        section = "general"
+
+    # Root token hint: '2YS' appears to be ship-related; 'vLc' suit/storage.
+    root = sel.split(".", 1)[0]
+    owner = {"2YS": "ship", "vLc": "character"}.get(root, "unknown")
+    # Interned once here, so every totals key shares the same label objects
+    return tuple(steps), sys.intern(section), sys.intern(owner)
+
+def _sum_slots(slots: List[Any]) -> DefaultDict[str, int]:
+    """
+    Sum one slot list by resource id. Keying on the bare id string lets the per-slot
+    work skip building an (owner, section, id) tuple; the caller adds that prefix
+    once per distinct id.
+    Fast path for the canonical save shape (dict slots with a str "Id" and a numeric
+    "Amount"); the first slot that doesn't fit re-runs the list through the tolerant loop.
+    """
+    sums: DefaultDict[str, int] = defaultdict(int)
+    try:
+        for e in slots:
+            rid = e["Id"]
+            if type(rid) is not str:
+                raise TypeError
+            sums[rid] += int(e["Amount"])
+    except (KeyError, TypeError, ValueError):
+        return _sum_slots_general(slots)
+    return sums
 
-def _slot_records_from_inventory(owner_type: str, inv: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
-    # Walk through slot arrays; emit normalized item records
-    for section in ("Items", "Tech", "Cargo"):
-        slots = inv.get(section)
-        if isinstance(slots, list):
-            for sl in slots:
-                if _is_item_slot(sl):
-                    yield {
-                        "owner_type": owner_type,
-                        "section": _norm_key(section),
-                        "id": sl.get("Id"),
-                        "amount": sl.get("Amount", 0),
-                        "seed": sl.get("Seed"),
-                    }
+def _sum_slots_general(slots: List[Any]) -> DefaultDict[str, int]:
+    # Tolerant form: skips non-dict/id-less slots, stringifies ids, missing/empty Amount counts 0
+    sums: DefaultDict[str, int] = defaultdict(int)
+    for e in slots:
+        if not isinstance(e, dict):
+            continue
+        rid = e.get("Id")
+        if rid is None:
+            continue
+        if type(rid) is not str:  # Ids are almost always strings already
+            rid = str(rid)
+        sums[rid] += int(e.get("Amount", 0) or 0)
+    return sums
 
 def aggregate_inventory(js: Dict[str, Any], include_tech: bool = False) -> Dict[Tuple[str, str, str], int]:
     """Flatten full-parse JSON into {(owner_type, inventory, resource_id): total_amount}.
     Accepts the new full-parse shape that exposes an _index.inventories selector list.
     include_tech: if False, exclude 'tech' inventory section.
     """
-    totals: Dict[Tuple[str, str, str], int] = {}
     idx = js.get("_index", {}).get("inventories", [])
     if not isinstance(idx, list):
-        return totals
-
-    def _resolve_selector(root: Dict[str, Any], sel: str):
-        cur: Any = root
-        segs = sel.split(".")
-        for seg in segs:
-            # resolve any embedded [n] array steps within a single segment
-            while True:
-                m = __import__("re").match(r"^(.*?)(\[\d+\])(.*)$", seg)
-                if m:
-                    pre, idxs, post = m.group(1), m.group(2), m.group(3)
-                    if pre:
-                        cur = cur[pre]
-                    cur = cur[int(idxs[1:-1])]
-                    seg = post
-                    if not seg:
-                        break
-                else:
-                    if seg:
-                        cur = cur[seg]
-                    break
-        return cur
+        return {}
 
-    def _infer_section_from_selector(sel: str) -> str:
-        # Heuristic based on selector tokens seen in full-parse index:
-        #   '.PMT.' => cargo; '.hl?' => tech; else => general
-        if ".PMT." in sel:
-            return "cargo"
-        if ".hl?" in sel:
-            return "tech"
-        return "general"
-
-    def _infer_owner_from_selector(sel: str) -> str:
-        # Root token hint: '2YS' appears to be ship-related; 'vLc' suit/storage.
-        root = sel.split(".")[0]
-        if root == "2YS":
-            return "ship"
-        if root == "vLc":
-            return "character"
-        return "unknown"
+    # Order-preserving dedup (as nms_fullparse does when writing the index): a selector
+    # listed twice names the same slot list and must not be walked or counted twice.
+    try:
+        idx = dict.fromkeys(idx)
+    except TypeError:
+        pass  # unhashable junk entries; each is skipped by the loop below anyway
 
+    totals: DefaultDict[Tuple[str, str, str], int] = defaultdict(int)
     for sel in idx:
         try:
-            node = _resolve_selector(js, sel)
+            steps, inv_section, owner_type = _compile_selector(sel)
+            if not include_tech and inv_section == "tech":
+                continue  # decided per selector: tech rows never build a key
+            node: Any = js
+            for step in steps:
+                node = node[step]
         except Exception:
             continue
         if not isinstance(node, list):
             continue
-        inv_section = _infer_section_from_selector(sel)
-        owner_type = _infer_owner_from_selector(sel)
-        for e in node:
-            if not isinstance(e, dict):
-                continue
-            rid = e.get("Id")
-            if rid is None:
-                continue
-            amt = int(e.get("Amount", 0) or 0)
-            if not include_tech and inv_section == "tech":
-                continue
-            key = (owner_type, inv_section, str(rid))
-            totals[key] = totals.get(key, 0) + amt
-    return totals
+        # Interned ids: the same ~hundreds of ids recur across snapshots, so keys built
+        # from different saves share one string object and compare by identity
+        for rid, amt in _sum_slots(node).items():
+            totals[(owner_type, inv_section, sys.intern(rid))] += amt
+    return dict(totals)
@@ -1,13 +1,63 @@
 # scripts/python/pipeline/ledger/io_utils.py
+import functools
+import gzip
+import json
+import os
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Optional, TextIO, Union
+
+try:
+    import orjson  # optional, ~5x faster on multi-MB save JSON
+except ImportError:
+    orjson = None
 
 def pick_latest_json_from_path(path: Path, use_mtime=False) -> Dict[str, Path]:
+    """
+    Newest *.json directly under path, as {"path": Path, "mtime": float}.
+    Selection is always by mtime; use_mtime is accepted for call-site compatibility.
+    """
     best = None
-    for p in path.glob("*.json"):
-        ts = p.stat().st_mtime if use_mtime else p.stat().st_mtime
-        if best is None or ts > best[0]:
-            best = (ts, p)
+    # scandir hands back DirEntry objects from one readdir pass; no Path per candidate
+    with os.scandir(path) as it:
+        for e in it:
+            if not e.name.endswith(".json"):
+                continue
+            ts = e.stat().st_mtime
+            if best is None or ts > best[0]:
+                best = (ts, e.path)
     if not best:
         raise FileNotFoundError(f"No *.json under {path}")
-    return {"path": best[1], "mtime": best[0]}
+    return {"path": Path(best[1]), "mtime": best[0]}
+
+# Level 1: the outputs are large and short-lived, so speed matters more than ratio
+GZIP_LEVEL = 1
+
+def open_text(path: Union[str, Path], mode: str = "r", newline: Optional[str] = None,
+              errors: Optional[str] = None) -> TextIO:
+    """UTF-8 text open; a .gz path is (de)compressed transparently."""
+    if str(path).endswith(".gz"):
+        kw = {"compresslevel": GZIP_LEVEL} if "w" in mode else {}
+        return gzip.open(path, mode + "t", encoding="utf-8", errors=errors, newline=newline, **kw)  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8", errors=errors, newline=newline)
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Parse a JSON file: one bulk read, orjson's C parser when installed, stdlib otherwise."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+@functools.lru_cache(maxsize=8)
+def _load_save(path: str, mtime_ns: int, size: int) -> Any:
+    return read_json(path)
+
+def load_save_json(path: Union[str, Path]) -> Any:
+    """
+    Parsed save JSON, cached per (path, mtime, size) so the timestamp lookup and the
+    inventory aggregation of one save share a single parse. A rewritten file misses
+    the cache. Callers get the shared object and must treat it as read-only.
+    """
+    p = os.path.abspath(path)
+    st = os.stat(p)
+    return _load_save(p, st.st_mtime_ns, st.st_size)
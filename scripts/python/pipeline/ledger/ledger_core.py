@@ -1,36 +1,48 @@
 # scripts/python/pipeline/ledger/ledger_core.py
+import datetime as dt
+from operator import itemgetter
 from typing import Any, Dict, Iterable, List, Tuple, Optional
 
 def diff_inventories(a: Dict[Tuple[str, str], int], b: Dict[Tuple[str, str], int]) -> Dict[Tuple[str, str], int]:
     """Return b - a for each key in either map."""
-    keys = set(a.keys()) | set(b.keys())
-    return {k: b.get(k, 0) - a.get(k, 0) for k in keys}
+    keys = a.keys() | b.keys()  # keys views union directly into one set
+    ag, bg = a.get, b.get
+    return {k: bg(k, 0) - ag(k, 0) for k in keys}
 
 def coalesce_sessions(rows: Iterable[Dict[str, Any]], max_gap_sec: int = 900) -> List[List[Dict[str, Any]]]:
     """Group chronological rows into sessions if adjacent timestamps are close."""
     out: List[List[Dict[str, Any]]] = []
-    prev = None
-    for r in sorted(rows, key=lambda x: x["ts"]):
+    # Compare against a prebuilt timedelta: no total_seconds() call or float per row
+    max_gap = dt.timedelta(seconds=max_gap_sec)
+    cur: List[Dict[str, Any]] = []
+    prev_ts = None
+    for r in sorted(rows, key=itemgetter("ts")):
+        ts = r["ts"]
         if not out:
-            out.append([r]); prev = r; continue
-        gap = (r["ts"] - prev["ts"]).total_seconds()
-        if gap <= max_gap_sec:
-            out[-1].append(r)
+            cur = [r]; out.append(cur)
+        elif ts - prev_ts <= max_gap:
+            cur.append(r)
         else:
-            out.append([r])
-        prev = r
+            cur = [r]; out.append(cur)
+        prev_ts = ts
     return out
 
+# Rows per multi-row INSERT (4 binds each: 40k placeholders, under the 65535 limit)
+LEDGER_BATCH = 10000
+
 def write_ledger_to_db(rows: List[Dict[str, Any]], env_path, table: str, verbose: bool = False) -> None:
-    """Insert ledger rows into MariaDB."""
-    from .db_conn import _db_connect_from_env
-    import datetime as dt
-    conn = _db_connect_from_env(env_path)
-    try:
-        cur = conn.cursor()
-        sql = f"INSERT INTO {table}(ts, owner_type, item_id, delta) VALUES (%s,%s,%s,%s)"
-        for r in rows:
-            cur.execute(sql, (r["ts"], r["owner_type"], r["item_id"], r["delta"]))
-        conn.commit()
-    finally:
-        conn.close()
+    """
+    Insert ledger rows into MariaDB.
+    One connection and one transaction; one multi-row INSERT per LEDGER_BATCH rows, as
+    initial_import_to_db does. Unlike executemany this stays one statement per batch on
+    servers without the MariaDB bulk protocol (MySQL), where the driver loops row by row.
+    """
+    from .db_conn import _db_session
+    sql_head = f"INSERT INTO {table}(ts, owner_type, item_id, delta) VALUES "
+    with _db_session(env_path) as conn:
+        # Prepared cursor: full batches share one SQL text, parsed once by the server
+        cur = conn.cursor(prepared=True)
+        for i in range(0, len(rows), LEDGER_BATCH):
+            batch = rows[i:i + LEDGER_BATCH]
+            flat = [v for r in batch for v in (r["ts"], r["owner_type"], r["item_id"], r["delta"])]
+            cur.execute(sql_head + ",".join(["(%s,%s,%s,%s)"] * len(batch)), flat)
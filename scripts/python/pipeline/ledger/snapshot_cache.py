@@ -0,0 +1,134 @@
+# scripts/python/pipeline/ledger/snapshot_cache.py
+# Persistent per-snapshot cache: (timestamp, inventory totals) keyed by
+# (abs_path, st_size, st_mtime_ns, include_tech, use_mtime).
+# Unchanged saves cost one stat() and a row read on repeat runs instead of a full parse.
+# WAL + one autocommitted INSERT per store, as in pipeline/_hashcache.py.
+import atexit
+import datetime as dt
+import json
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+DEFAULT_DB = Path(__file__).resolve().parents[4] / ".cache" / "ledger_snapshots.sqlite"
+BUSY_TIMEOUT = 0.25  # seconds to wait on a locked DB before treating it as a miss/skip
+
+# Bump whenever aggregate_inventory / canonical_ts_from_file output changes: rows are
+# looked up in a per-version table, so results from older logic are never served.
+CACHE_VERSION = 2
+_TABLE = f"snapshot_v{CACHE_VERSION}"
+
+Totals = Dict[Tuple[str, str, str], int]
+
+_lock = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+_conn_path: Optional[str] = None
+
+def _connect(db_path: Union[str, Path]) -> Optional[sqlite3.Connection]:
+    """Open (once per process) the cache DB in autocommit mode; each write commits on its own."""
+    global _conn, _conn_path
+    db_path = str(db_path)
+    if _conn is not None and _conn_path == db_path:
+        return _conn
+    try:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                               isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error:
+            pass  # another process is switching modes; rollback journal still works
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {_TABLE}("
+            "path TEXT, include_tech INTEGER, use_mtime INTEGER, size INTEGER, mtime_ns INTEGER, "
+            "payload TEXT, PRIMARY KEY (path, include_tech, use_mtime))"
+        )
+    except sqlite3.Error:
+        return None
+    if _conn is not None:
+        _close()
+    _conn, _conn_path = conn, db_path
+    return conn
+
+def _close() -> None:
+    global _conn, _conn_path
+    if _conn is None:
+        return
+    try:
+        _conn.close()
+    except sqlite3.Error:
+        pass
+    _conn, _conn_path = None, None
+
+atexit.register(_close)
+
+def _encode(ts: dt.datetime, totals: Totals) -> str:
+    # Tuple keys don't survive JSON: store rows, which also keeps the totals' order
+    return json.dumps({"ts": ts.isoformat(), "rows": [[o, s, r, a] for (o, s, r), a in totals.items()]},
+                      ensure_ascii=False, separators=(",", ":"))
+
+def _decode(payload: str) -> Tuple[dt.datetime, Totals]:
+    obj = json.loads(payload)
+    # Interned like aggregate_inventory's keys, so cached and fresh totals share strings
+    intern = sys.intern
+    return dt.datetime.fromisoformat(obj["ts"]), {(intern(o), intern(s), intern(r)): a
+                                                  for o, s, r, a in obj["rows"]}
+
+def _compute(path: str, include_tech: bool, use_mtime: bool) -> Tuple[dt.datetime, Totals]:
+    from .inventory import aggregate_inventory
+    from .io_utils import load_save_json
+    from .ts_utils import canonical_ts_from_file
+    ts = canonical_ts_from_file(path, use_mtime=use_mtime)
+    return ts, aggregate_inventory(load_save_json(path), include_tech=include_tech)
+
+def _lookup(key: Tuple[str, int, int], st: os.stat_result,
+            db_path: Union[str, Path]) -> Optional[Tuple[dt.datetime, Totals]]:
+    with _lock:
+        conn = _connect(db_path)
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                f"SELECT size, mtime_ns, payload FROM {_TABLE} "
+                "WHERE path = ? AND include_tech = ? AND use_mtime = ?", key
+            ).fetchone()
+            if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+                return _decode(row[2])
+        except (sqlite3.Error, ValueError, KeyError, TypeError):
+            pass  # unreadable row: recompute and overwrite it
+    return None
+
+def _store(key: Tuple[str, int, int], st: os.stat_result, ts: dt.datetime, totals: Totals,
+           db_path: Union[str, Path]) -> None:
+    with _lock:
+        conn = _connect(db_path)
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {_TABLE}(path, include_tech, use_mtime, size, mtime_ns, payload) "
+                "VALUES (?,?,?,?,?,?)",
+                key + (st.st_size, st.st_mtime_ns, _encode(ts, totals)),
+            )
+        except sqlite3.Error:
+            pass
+
+def load_snapshot(path: Union[str, Path], include_tech: bool = False, use_mtime: bool = False,
+                  db_path: Union[str, Path] = DEFAULT_DB) -> Tuple[dt.datetime, Totals]:
+    """
+    (canonical timestamp, aggregate_inventory totals) for one save JSON.
+    Served from the cache while (size, mtime_ns) still match, else computed and recorded.
+    Cache errors fall back to computing; parse errors propagate as before.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), int(include_tech), int(use_mtime))
+    hit = _lookup(key, st, db_path)
+    if hit is not None:
+        return hit
+    ts, totals = _compute(key[0], include_tech, use_mtime)
+    _store(key, st, ts, totals, db_path)
+    return ts, totals
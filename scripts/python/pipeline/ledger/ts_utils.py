@@ -1,8 +1,31 @@
 # scripts/python/pipeline/ledger/ts_utils.py
 from typing import Any, Dict, List, Optional
 import datetime as dt
+import re
+import sys
+
+from .io_utils import load_save_json
 
 # ---------------- Timestamp helpers ----------------
+_PY311 = sys.version_info >= (3, 11)  # fromisoformat accepts a trailing 'Z' natively
+
+def _fromiso(s: str) -> dt.datetime:
+    if not _PY311 and s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    return dt.datetime.fromisoformat(s)
+
+# Every string fromisoformat accepts starts with a 4-digit year
+_ISO_YEAR_RE = re.compile(r"[0-9]{4}")
+
+def _try_fromiso(s: str) -> Optional[dt.datetime]:
+    """_fromiso, or None; non-ISO candidates are rejected by one anchored match, not an exception."""
+    if not _ISO_YEAR_RE.match(s):
+        return None
+    try:
+        return _fromiso(s)
+    except ValueError:
+        return None
+
 def parse_any_timestamp(js: Dict[str, Any]) -> Optional[dt.datetime]:
     candidates: List[str] = []
     for k in ("Timestamp", "SaveTime"):
@@ -16,20 +39,46 @@ def parse_any_timestamp(js: Dict[str, Any]) -> Optional[dt.datetime]:
             if isinstance(v, str):
                 candidates.append(v)
     for s in candidates:
+        ts = _try_fromiso(s)
+        if ts is not None:
+            return ts
+    return None
+
+# Top-of-file "Timestamp"/"SaveTime" string fields; scanned in a bounded head read
+_HEAD_TS_RE = re.compile(rb'"(Timestamp|SaveTime)"\s*:\s*"([^"\\]+)"')
+HEAD_SCAN_BYTES = 8192
+
+def _ts_from_head(head: bytes) -> Optional[dt.datetime]:
+    found: Dict[bytes, bytes] = {}
+    for m in _HEAD_TS_RE.finditer(head):
+        found.setdefault(m.group(1), m.group(2))
+    for k in (b"Timestamp", b"SaveTime"):  # same preference as parse_any_timestamp
+        v = found.get(k)
+        if v is None:
+            continue
         try:
-            return dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
-        except Exception:
-            pass
+            ts = _try_fromiso(v.decode("utf-8"))
+        except UnicodeDecodeError:
+            continue
+        if ts is not None:
+            return ts
     return None
 
 def canonical_ts_from_file(path: str, use_mtime: bool = False) -> dt.datetime:
-    """Prefer in-file Timestamp/SaveTime; fallback to mtime when asked."""
+    """
+    Prefer in-file Timestamp/SaveTime; fallback to mtime when asked.
+    The first HEAD_SCAN_BYTES are scanned for the field before paying for a full parse,
+    which goes through load_save_json's cache.
+    """
     p = str(path)
     if not use_mtime:
         try:
-            import json
-            from pathlib import Path
-            js = json.loads(Path(p).read_text(encoding="utf-8"))
+            with open(p, "rb") as f:
+                ts = _ts_from_head(f.read(HEAD_SCAN_BYTES))
+            if ts:
+                return ts
+            # Shared parse: aggregating the same save afterwards is a cache hit
+            js = load_save_json(p)
             ts = parse_any_timestamp(js)  # type: ignore
             if ts:
                 return ts
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
-import argparse, json, subprocess, sys, tempfile
+import argparse, json, re, subprocess, sys, tempfile
 from pathlib import Path
-from typing import Any, Dict, Tuple, List
+from typing import Any, Dict, Tuple, List, Optional
+
+try:
+    import orjson  # optional: C parser, takes UTF-8 bytes directly
+except ImportError:
+    orjson = None
 
 # ---------- I/O helpers ----------
 
@@ -17,10 +22,51 @@ def _write_bytes(p: Path, b: bytes) -> None:
 # ---------- cleaning / parsing ----------
 
 def _clean_trailing_nuls(data: bytes) -> Tuple[bytes, int]:
-    i = len(data)
-    while i > 0 and data[i-1] == 0x00:
-        i -= 1
-    return data[:i], (len(data) - i)
+    stripped = data.rstrip(b"\x00")  # one C loop instead of a per-byte Python walk
+    return stripped, len(data) - len(stripped)
+
+# Brace matcher jumps between the only characters that change scanner state,
+# so the bytes in between are skipped by the C regex engine, not the interpreter.
+_OUT_STR_B = re.compile(rb'["{}]')
+_IN_STR_B = re.compile(rb'["\\]')
+_OUT_STR_T = re.compile(r'["{}]')
+_IN_STR_T = re.compile(r'["\\]')
+
+def _match_top_level_end(buf, start: int, out_str, in_str) -> int:
+    """
+    End offset (exclusive) of the object opening at buf[start] ('{'), or -1.
+    Same state machine as a per-char loop: quotes toggle strings, backslash
+    escapes the next char inside strings, braces count depth outside them.
+    """
+    if isinstance(buf, bytes):
+        quote, bslash, lbrace = b'"', b"\\", b"{"
+    else:
+        quote, bslash, lbrace = '"', "\\", "{"
+    depth = 0
+    pos = start
+    while True:
+        m = out_str.search(buf, pos)
+        if m is None:
+            return -1
+        ch = m.group()
+        pos = m.end()
+        if ch == quote:
+            # skip to the closing quote, stepping over escaped characters
+            while True:
+                m = in_str.search(buf, pos)
+                if m is None:
+                    return -1
+                pos = m.end()
+                if m.group() == bslash:
+                    pos += 1
+                    continue
+                break
+        elif ch == lbrace:
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
 
 def _extract_top_level_json_bytes(data: bytes) -> bytes:
     """
@@ -28,7 +74,7 @@ def _extract_top_level_json_bytes(data: bytes) -> bytes:
     Handles UTF-8 bytes directly; if it looks like UTF-16 (BOM or many NULs),
     decode to text first and then crop.
     """
-    if data.startswith(b"\xff\xfe") or data.startswith(b"\xfe\xff") or b"\x00" in data[:128]:
+    if _looks_utf16(data):
         try:
             text = data.decode("utf-16")
         except Exception as e:
@@ -36,26 +82,7 @@ def _extract_top_level_json_bytes(data: bytes) -> bytes:
         start = text.find("{")
         if start < 0:
             raise SystemExit("[ERR] Could not find '{' in UTF-16 text.")
-        depth, in_str, esc = 0, False, False
-        end = -1
-        for i, ch in enumerate(text[start:], start):
-            if in_str:
-                if esc:
-                    esc = False
-                elif ch == "\\":
-                    esc = True
-                elif ch == "\"":
-                    in_str = False
-            else:
-                if ch == "\"":
-                    in_str = True
-                elif ch == "{":
-                    depth += 1
-                elif ch == "}":
-                    depth -= 1
-                    if depth == 0:
-                        end = i + 1
-                        break
+        end = _match_top_level_end(text, start, _OUT_STR_T, _IN_STR_T)
         if end < 0:
             raise SystemExit("[ERR] Could not find matching '}' for top-level JSON (UTF-16).")
         return text[start:end].encode("utf-8")
@@ -64,55 +91,87 @@ def _extract_top_level_json_bytes(data: bytes) -> bytes:
     if start < 0:
         prefix = data[:16].hex(" ")
         raise SystemExit(f"[ERR] Could not find '{{' in data. First 16 bytes: {prefix}")
-    depth, in_str, esc = 0, False, False
-    end = -1
-    for i in range(start, len(data)):
-        b = data[i]
-        if in_str:
-            if esc:
-                esc = False
-            elif b == 0x5C:      # backslash
-                esc = True
-            elif b == 0x22:      # quote
-                in_str = False
-        else:
-            if b == 0x22:        # quote
-                in_str = True
-            elif b == 0x7B:      # {
-                depth += 1
-            elif b == 0x7D:      # }
-                depth -= 1
-                if depth == 0:
-                    end = i + 1
-                    break
+    end = _match_top_level_end(data, start, _OUT_STR_B, _IN_STR_B)
     if end < 0:
         raise SystemExit("[ERR] Could not find matching '}' for top-level JSON (UTF-8).")
     return data[start:end]
 
-def _parse_json_bytes_strict(data: bytes) -> Tuple[Dict[str, Any], int, int]:
+def _looks_utf16(data: bytes) -> bool:
+    return data.startswith(b"\xff\xfe") or data.startswith(b"\xfe\xff") or b"\x00" in data[:128]
+
+_JSON_WS = b" \t\r\n"
+
+def _byte_offset(view: memoryview, char_pos: int) -> int:
+    """Byte offset in UTF-8 view of character offset char_pos (orjson error positions count characters)."""
+    head = bytes(view[:char_pos * 4])  # a character is at most 4 bytes
+    if head[:char_pos].isascii():
+        return char_pos
+    return len(head.decode("utf-8", "ignore")[:char_pos].encode("utf-8"))
+
+def _parse_utf8_fast(data: bytes) -> Optional[Tuple[Any, int, int]]:
+    """
+    Parse the first top-level object in UTF-8 data in C, letting the parser find its end
+    instead of brace-matching first. Returns (obj, start, end) or None to take the slow path.
+    """
+    if _looks_utf16(data):
+        return None
+    start = data.find(b"{")
+    if start < 0:
+        return None
+    view = memoryview(data)[start:]
+    # Trailing whitespace counts as junk, exactly as with the brace scanner
+    if orjson is not None:
+        try:
+            return orjson.loads(view), start, start + len(data[start:].rstrip(_JSON_WS))
+        except orjson.JSONDecodeError as e:
+            # Trailing junk: the error offset is just past the document (plus whitespace).
+            # A mid-document error leaves an unclosed prefix that fails to parse below.
+            doc = bytes(view[:_byte_offset(view, e.pos)]).rstrip(_JSON_WS)
+            try:
+                return orjson.loads(doc), start, start + len(doc)
+            except orjson.JSONDecodeError:
+                return None
+    try:
+        text = data[start:].decode("utf-8")
+        obj, end = json.JSONDecoder().raw_decode(text)
+    except ValueError:  # includes UnicodeDecodeError
+        return None
+    return obj, start, start + len(text[:end].encode("utf-8"))
+
+def _parse_json_bytes_strict(data: bytes) -> Tuple[Dict[str, Any], int, int, Optional[bytes]]:
     """
     Trim trailing NULs, crop to first complete JSON object, decode, json.loads.
-    Returns (json_obj, nul_trimmed_count, junk_trimmed_count).
+    Returns (json_obj, nul_trimmed_count, junk_trimmed_count, utf8_doc).
+    utf8_doc is the cropped document when it parsed as UTF-8 as-is (safe to write verbatim), else None.
     Decode order: UTF-8 -> UTF-16 (rare) -> Latin-1 (Windows-1252).
     """
     data, nul_count = _clean_trailing_nuls(data)
+    fast = _parse_utf8_fast(data)
+    if fast is not None:
+        js, start, end = fast
+        return js, nul_count, (len(data) - (end - start)), data[start:end]
     cropped = _extract_top_level_json_bytes(data)
 
-    # Try UTF-8 first
+    # Try UTF-8 first (orjson validates UTF-8 itself; stdlib fallback for anything it rejects, e.g. NaN)
+    if orjson is not None:
+        try:
+            return orjson.loads(cropped), nul_count, (len(data) - len(cropped)), cropped
+        except orjson.JSONDecodeError:
+            pass
     try:
-        return json.loads(cropped.decode("utf-8")), nul_count, (len(data) - len(cropped))
+        return json.loads(cropped.decode("utf-8")), nul_count, (len(data) - len(cropped)), cropped
     except UnicodeDecodeError:
         pass
 
     # Try UTF-16 in case we mis-detected earlier (unlikely here)
     try:
-        return json.loads(cropped.decode("utf-16")), nul_count, (len(data) - len(cropped))
+        return json.loads(cropped.decode("utf-16")), nul_count, (len(data) - len(cropped)), None
     except Exception:
         pass
 
     # Finally, be permissive: Latin-1 (CP1252-ish) to tolerate 0x80..0x9F bytes
     try:
-        return json.loads(cropped.decode("latin-1")), nul_count, (len(data) - len(cropped))
+        return json.loads(cropped.decode("latin-1")), nul_count, (len(data) - len(cropped)), None
     except Exception as e:
         px = data[:16].hex(" ")
         raise SystemExit(f"[ERR] JSON parse failed after UTF-8/16/Latin-1 attempts: {e}. First 16 bytes: {px}")
@@ -193,11 +252,16 @@ def main():
         produced = f"loaded from {jpath.name}"
 
     # Parse strictly
-    js, nul_trimmed, junk_trimmed = _parse_json_bytes_strict(raw)
+    js, nul_trimmed, junk_trimmed, utf8_doc = _parse_json_bytes_strict(raw)
 
-    # Write final JSON
-    payload = json.dumps(js, ensure_ascii=False, indent=2).encode("utf-8") if args.pretty \
-              else json.dumps(js, separators=(",", ":")).encode("utf-8")
+    # Write final JSON; a document that already parsed as UTF-8 is written as-is
+    # (NULs/junk cropped) instead of being re-serialized
+    if args.pretty:
+        payload = json.dumps(js, ensure_ascii=False, indent=2).encode("utf-8")
+    elif utf8_doc is not None:
+        payload = utf8_doc
+    else:
+        payload = json.dumps(js, separators=(",", ":")).encode("utf-8")
     _write_bytes(out_path, payload)
 
     print(f"[OK] {produced}")
@@ -4,7 +4,12 @@
 # - Also supports gzip, lz4-frame, zlib, or plain JSON
 # - Slices exactly the top-level JSON and auto-decodes UTF-8/16/32; falls back to Latin-1
 # - --debug prints block stats and writes a raw decompressed stream
-import argparse, json, os, sys, gzip, zlib, struct, pathlib
+import argparse, json, os, re, sys, gzip, zlib, struct, pathlib
+
+try:
+    import orjson  # optional: C parse + compact UTF-8 dump in one call each
+except ImportError:
+    orjson = None
 
 MAGIC_BLOCK = 0xFEEDA1E5
 MAGIC_GZIP  = b"\x1f\x8b"
@@ -16,11 +21,29 @@ def read_bytes(p: str) -> bytes:
 
 # ---------- JSON helpers ----------
 
-def decode_json_text(text: str) -> bytes:
+def decode_json_text(text) -> bytes:
+    """Parse JSON text (str, or UTF-8 bytes) and normalize to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(orjson.loads(text))
+        except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+            pass  # e.g. NaN literals or lone surrogates: let the stdlib decide
+    if isinstance(text, (bytes, bytearray)):
+        text = text.decode("utf-8")
     obj = json.loads(text)
     # Normalize to UTF-8 JSON
     return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
+def pretty_json_bytes(data: bytes) -> bytes:
+    """Re-indent compact UTF-8 JSON bytes (2 spaces, non-ASCII kept as UTF-8)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(orjson.loads(data), option=orjson.OPT_INDENT_2)
+        except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+            pass  # e.g. NaN literals kept by the stdlib fallback in decode_json_text
+    obj = json.loads(data.decode("utf-8"))
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
 def try_decode_variants(b: bytes):
     """
     Try decoding a buffer as JSON text using several encodings.
@@ -43,9 +66,9 @@ def try_decode_variants(b: bytes):
         try: return decode_json_text(b.decode("utf-16-be"))
         except: pass
 
-    # No BOM — UTF-8 first
+    # No BOM — UTF-8 first (bytes go straight to the parser, no str round-trip)
     try:
-        return decode_json_text(b.decode("utf-8"))
+        return decode_json_text(b)
     except:
         pass
 
@@ -69,46 +92,95 @@ def try_decode_variants(b: bytes):
     except:
         return None
 
+# Scanner stops only on bytes that change its state; everything in between is
+# skipped inside the C regex engine instead of one interpreter step per byte.
+_OPEN_RE = re.compile(rb"[{\[]")
+_STRUCT_RE = re.compile(rb'["{}\[\]]')
+_IN_STR_RE = re.compile(rb'["\\]')
+
+def _orjson_doc_end(buf: bytes, start: int):
+    """
+    End offset of a *valid* UTF-8 JSON document starting at buf[start], found by orjson
+    (for valid JSON this is exactly where the brace scanner would stop); None otherwise.
+    """
+    view = memoryview(buf)
+    try:
+        orjson.loads(view[start:])
+        end, verified = len(buf), True
+    except orjson.JSONDecodeError as e:
+        # Trailing noise: the offset sits just past the document, counted in characters
+        head = bytes(view[start:start + e.pos * 4])
+        n = e.pos if head[:e.pos].isascii() else len(head.decode("utf-8", "ignore")[:e.pos].encode("utf-8"))
+        end, verified = start + n, False
+    while end > start and buf[end - 1] in b" \t\r\n":  # (+ whitespace)
+        end -= 1
+    if verified:
+        return end
+    try:
+        orjson.loads(view[start:end])
+        return end
+    except orjson.JSONDecodeError:
+        return None
+
 def slice_top_level_json(buf: bytes):
     """Return (start,end) of the first complete top-level JSON object/array in a noisy byte buffer."""
-    n = len(buf)
-    i = 0
-    # find first '{' or '[' anywhere
-    while i < n and buf[i] not in (ord("{"), ord("[")):
-        i += 1
-    while i < n:
-        if buf[i] not in (ord("{"), ord("[")):
-            i += 1; continue
-        start = i; depth = 0; in_str = False; esc = False
-        j = i
-        while j < n:
-            ch = buf[j]
-            if in_str:
-                if esc: esc = False
-                elif ch == ord("\\"): esc = True
-                elif ch == ord('"'): in_str = False
+    m = _OPEN_RE.search(buf)
+    if m is not None and orjson is not None:
+        end = _orjson_doc_end(buf, m.start())
+        if end is not None:
+            return (m.start(), end)
+    while m is not None:
+        start = m.start()
+        depth = 0
+        pos = start
+        while True:
+            t = _STRUCT_RE.search(buf, pos)
+            if t is None:
+                break  # unclosed from this opener
+            ch = buf[t.start()]
+            pos = t.end()
+            if ch == 0x22:  # '"': skip the string body, stepping over escaped bytes
+                while True:
+                    q = _IN_STR_RE.search(buf, pos)
+                    if q is None:
+                        break
+                    pos = q.end()
+                    if buf[q.start()] == 0x5C:  # backslash
+                        pos += 1
+                        continue
+                    break
+                if q is None:
+                    break
+            elif ch in (0x7B, 0x5B):  # '{' '['
+                depth += 1
             else:
-                if ch == ord('"'): in_str = True
-                elif ch in (ord("{"), ord("[")): depth += 1
-                elif ch in (ord("}"), ord("]")):
-                    depth -= 1
-                    if depth == 0:
-                        return (start, j + 1)
-            j += 1
-        i = start + 1
-        while i < n and buf[i] not in (ord("{"), ord("[")):
-            i += 1
+                depth -= 1
+                if depth == 0:
+                    return (start, pos)
+        # retry from the next opener after this one
+        m = _OPEN_RE.search(buf, start + 1)
     return None
 
+_TAIL_PAD = b" \t\r\n\x00"
+
 def bytes_to_json_bytes(b: bytes, debug=False, dbg_prefix=""):
     """Normalize bytes that *contain* JSON (with possible noise) to canonical UTF-8 JSON bytes."""
     buf = b.rstrip(b"\x00")
 
-    # Fast path: decode entire buffer
-    out = try_decode_variants(buf)
-    if out is not None:
-        if debug: print(f"[DBG] {dbg_prefix}fast-path decoded entire buffer", file=sys.stderr)
-        return out
+    # Fast path: decode entire buffer. An object/array document can only parse whole if the
+    # buffer ends on its closing bracket (whitespace and UTF-16/32 NUL padding aside);
+    # decompressed HG streams usually carry trailing noise, so peek before paying for a
+    # full decode of a multi-MB buffer that is bound to fail.
+    tail = len(buf)
+    while tail and buf[tail - 1] in _TAIL_PAD:
+        tail -= 1
+    if tail and buf[tail - 1] in b"}]":
+        out = try_decode_variants(buf)
+        if out is not None:
+            if debug: print(f"[DBG] {dbg_prefix}fast-path decoded entire buffer", file=sys.stderr)
+            return out
+    elif debug:
+        print(f"[DBG] {dbg_prefix}trailing noise after JSON; skipping whole-buffer decode", file=sys.stderr)
 
     # Slice exact JSON and try again
     sl = slice_top_level_json(buf)
@@ -144,8 +216,11 @@ def decode_hg_blocks_scan_all(b: bytes, debug=False):
         import lz4.block as lz4b  # pip install lz4
     except Exception:
         raise RuntimeError("python-lz4 is required (pip install lz4) to decode HG block saves.")
-    out = bytearray()
+    # Decompressed blocks are collected and joined once at the end: one exact-size
+    # allocation instead of repeated bytearray growth plus a final bytes() copy.
+    parts = []
     magic_bytes = struct.pack("<I", MAGIC_BLOCK)
+    mv = memoryview(b)  # zero-copy block slices; lz4 takes any buffer
     pos = 0
     n = len(b)
     found = []
@@ -163,14 +238,14 @@ def decode_hg_blocks_scan_all(b: bytes, debug=False):
             if end > n:
                 pos = idx + 4
                 continue
-            chunk = b[start:end]
+            chunk = mv[start:end]
             try:
                 dec = lz4b.decompress(chunk, uncompressed_size=decomp_sz)
             except Exception:
                 # false positive magic inside random data; skip ahead a byte
                 pos = idx + 1
                 continue
-            out += dec
+            parts.append(dec)
             found.append((idx, comp_sz, decomp_sz))
             pos = end
         except Exception:
@@ -183,7 +258,7 @@ def decode_hg_blocks_scan_all(b: bytes, debug=False):
             print("[DBG]   ...", file=sys.stderr)
     if not found:
         raise RuntimeError("HG block magic not found anywhere in file.")
-    return bytes(out), found
+    return b"".join(parts), found
 
 def decode_gzip(b: bytes):
     try:
@@ -269,8 +344,7 @@ def main():
     json_bytes = decode_to_json_bytes(raw, debug=args.debug, outdir=outdir)
 
     if args.pretty:
-        obj = json.loads(json_bytes.decode("utf-8"))
-        json_bytes = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        json_bytes = pretty_json_bytes(json_bytes)
 
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
     with open(args.out, "wb") as f:
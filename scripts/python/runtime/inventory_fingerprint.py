@@ -24,16 +24,41 @@ import os
 import re
 import json
 import time
-import glob
 import hashlib
 from typing import Optional, Tuple
 
+try:
+    import orjson  # optional: C parser for large decoded saves
+except ImportError:
+    orjson = None
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 
+# Package-import shim for direct execution (python3 scripts/python/runtime/inventory_fingerprint.py)
+if __package__ in (None, ""):
+    sys.path.insert(0, ROOT)
+from scripts.python.pipeline._hashcache import get_or_compute as _cached_fp
+
+# inv_fp per decoded JSON, keyed by (abs_path, st_size, st_mtime_ns): an unchanged save
+# costs one stat() instead of a full parse + hash on every runtime_refresh tick.
+# Kept beside the decoded saves it describes, so clearing storage/decoded clears it too.
+FP_CACHE_DB = os.path.join(ROOT, "storage", "decoded", ".invfp_cache", "invfp.sqlite")
+
 # -------------------------
 # Utilities
 # -------------------------
 
+def _load_json(path: str) -> object:
+    """Parse a JSON file from one bytes read; orjson when available (stdlib for NaN/Infinity it rejects)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
 def _load_env(env_path: str) -> dict:
     env = {}
     try:
@@ -78,13 +103,15 @@ def _to_epoch_seconds(val: object) -> Optional[str]:
     except Exception:
         return None
 
+_SAVEID_RE = re.compile(r"(st_[0-9]+)")
+
 def _derive_saveid_from_path(path: str) -> Optional[str]:
-    m = re.search(r"(st_[0-9]+)", path)
+    m = _SAVEID_RE.search(path)
     return m.group(1) if m else None
 
 def _derive_saveid_from_env(env: dict) -> str:
     sid = (env.get("NMS_PROFILE") or "").strip()
-    m = re.match(r"(st_[0-9]+)", sid)
+    m = _SAVEID_RE.match(sid)
     return m.group(1) if m else "default"
 
 # -------------------------
@@ -94,8 +121,7 @@ def _derive_saveid_from_env(env: dict) -> str:
 def _read_manifest() -> Optional[dict]:
     p = os.path.join(ROOT, "storage", "decoded", "_manifest_recent.json")
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _load_json(p)
     except Exception:
         return None
 
@@ -138,34 +164,47 @@ def _manifest_decoded_path_and_epoch() -> Tuple[Optional[str], Optional[str]]:
     return None, epoch
 
 def _find_latest_decoded_glob() -> Optional[str]:
+    """Newest storage/decoded/save*.json: one scandir pass, stat taken from each entry."""
     decoded_dir = os.path.join(ROOT, "storage", "decoded")
+    best, best_mtime = None, None
     try:
-        candidates = glob.glob(os.path.join(decoded_dir, "save*.json"))
-        if not candidates:
-            return None
-        candidates.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-        return candidates[0]
+        with os.scandir(decoded_dir) as it:
+            for e in it:
+                name = e.name
+                if not (name.startswith("save") and name.endswith(".json")):
+                    continue
+                m = e.stat().st_mtime
+                if best_mtime is None or m > best_mtime:
+                    best, best_mtime = e.path, m
     except Exception:
         return None
+    return best
 
 # -------------------------
 # Fingerprint computation
 # -------------------------
 
+HASH_SLICE = 1 << 20  # chars per update when hashing the stdlib serialization
+
 def _sha256_of_json(doc: object) -> str:
-    """Stable hash of entire JSON content (sorted keys, no whitespace)."""
-    data = json.dumps(doc, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    return hashlib.sha256(data).hexdigest()
+    """
+    Stable hash of entire JSON content (sorted keys, no whitespace).
+    Always the stdlib json.dumps form, so the digest does not depend on which parser is installed.
+    """
+    # ensure_ascii output: encode slice by slice rather than copying the whole string at once
+    text = json.dumps(doc, sort_keys=True, separators=(",", ":"))
+    h = hashlib.sha256()
+    for i in range(0, len(text), HASH_SLICE):
+        h.update(text[i:i + HASH_SLICE].encode("ascii"))
+    return h.hexdigest()
 
 def _fingerprint_from_decoded(json_path: str, manifest_epoch: Optional[str], env: dict) -> Optional[dict]:
     if not os.path.isfile(json_path):
         return None
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            doc = json.load(f)
+        inv_fp = _cached_fp(json_path, lambda p: _sha256_of_json(_load_json(p)), db_path=FP_CACHE_DB)
     except Exception:
         return None
-    inv_fp = _sha256_of_json(doc)
     # Prefer manifest epoch for raw-save mtime; else fallback to decoded file's mtime
     mtime = manifest_epoch or str(int(os.path.getmtime(json_path)))
     saveid = _derive_saveid_from_path(json_path) or _derive_saveid_from_env(env)
@@ -204,8 +243,8 @@ def main() -> int:
 
     env = _ensure_env_loaded()
     if (env.get("INVFP_ENABLED", "1").strip().strip('"') == "0"):
-    _emit({})  # empty object => downstream treats as “no candidate fp”
-    return 0
+        _emit({})  # empty object => downstream treats as “no candidate fp”
+        return 0
 
 
     if use_latest and not decoded_path:
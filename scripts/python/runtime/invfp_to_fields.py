@@ -3,6 +3,8 @@
 # inv_fp\nbase\nmtime\nsaveid
 import json, sys, re
 
+_HEX64_RE = re.compile(r"[0-9a-fA-F]{64}")
+
 def main():
     data = sys.stdin.read().strip()
     # If it looks like JSON, parse expected keys
@@ -22,7 +24,7 @@ def main():
         pass
 
     # Otherwise, accept a simple 64-hex hash as inv_fp-only
-    if re.fullmatch(r"[0-9a-fA-F]{64}", data):
+    if _HEX64_RE.fullmatch(data):
         print(data)
         print("")          # base
         print("")          # mtime
@@ -6,7 +6,8 @@ from typing import Any, Dict, List, Optional
 # --- tolerant loader for decoded & full JSONs (handles trailing bytes) ---
 def load_json_relaxed(path: str) -> Any:
     import json as _j
-    s = open(path, "r", encoding="utf-8", errors="ignore").read()
+    with open(path, "rb") as fh:
+        s = fh.read().decode("utf-8", errors="ignore")
     try: return _j.loads(s)
     except _j.JSONDecodeError: pass
     i,n=0,len(s)
@@ -12,6 +12,7 @@ Usage:
     --full output/fullparse/savenormal.full.json --in-place
 """
 import argparse, json, os, sys, glob
+from collections import defaultdict
 from typing import Dict, Any, Iterable, Tuple
 
 def load_json(path: str) -> Dict[str, Any]:
@@ -71,7 +72,7 @@ def aggregate_code_totals_from_top(by_owner_top_items: Dict[str, Any]) -> Dict[s
     Build a global code → total_count map by summing across owners’ top lists.
     Only uses the provided top lists (it does not scan *all* items).
     """
-    totals: Dict[str, int] = {}
+    totals: Dict[str, int] = defaultdict(int)
     for owner, arr in (by_owner_top_items or {}).items():
         if not isinstance(arr, list):
             continue
@@ -86,8 +87,8 @@ def aggregate_code_totals_from_top(by_owner_top_items: Dict[str, Any]) -> Dict[s
                 cnt = int(cnt)
             except Exception:
                 cnt = 0
-            totals[code] = totals.get(code, 0) + cnt
-    return totals
+            totals[code] += cnt
+    return dict(totals)
 
 def build_owner_code_union_top(by_owner_top_items: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -5,7 +5,8 @@ from typing import Any, Dict
 
 def load_json_relaxed(path: str) -> Any:
     import json as _j
-    s = open(path,"r",encoding="utf-8",errors="ignore").read()
+    with open(path, "rb") as fh:
+        s = fh.read().decode("utf-8", errors="ignore")
     try: return _j.loads(s)
     except _j.JSONDecodeError: pass
     i,n=0,len(s)
@@ -15,7 +15,8 @@ from typing import Any, Dict, List, Tuple
 
 # ---------- tolerant JSON loader (handles trailing bytes / concatenated docs) ----------
 def load_json_relaxed(path: str) -> Any:
-    s = open(path, "r", encoding="utf-8", errors="ignore").read()
+    with open(path, "rb") as fh:
+        s = fh.read().decode("utf-8", errors="ignore")
     try:
         return json.loads(s)
     except json.JSONDecodeError:
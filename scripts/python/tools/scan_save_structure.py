@@ -17,7 +17,7 @@ Optional:
 """
 
 import argparse, json, os, sys
-from collections import defaultdict
+from collections import Counter, defaultdict
 from typing import Any, Dict, List, Tuple
 
 def _extract_first_json_value(s: str) -> str | None:
@@ -112,8 +112,7 @@ def walk(obj: Any, path: str, paths_count: Dict[str, Dict[str,int]],
          keywords: List[str], max_samples: int) -> None:
     t = type(obj).__name__
     # Type tallies per path
-    bucket = paths_count[path]
-    bucket[t] = bucket.get(t, 0) + 1
+    paths_count[path][t] += 1
 
     # Keyword hits (record once per path with a small preview)
     low = path.lower()
@@ -159,7 +158,7 @@ def main():
     # <<< tolerant loader
     data = load_json_relaxed(src)
 
-    paths_count: Dict[str, Dict[str,int]] = defaultdict(dict)
+    paths_count: Dict[str, Dict[str,int]] = defaultdict(Counter)
     arrays: Dict[str, Dict[str,Any]] = defaultdict(dict)
     kw_hits: Dict[str, List[Dict[str,Any]]] = defaultdict(list)
 